@@ -6,7 +6,7 @@ import os
 import math
 import sys
 import re
-from modernCiphers import des_encrypt, des_decrypt, rc4_encrypt, rc4_decrypt, aes_encrypt, aes_decrypt, otp_decrypt, otp_encrypt, setCustomKeys, RSA_encrypt, RSA_decrypt, generate_dh_public_key, calculate_shared_secret, dh_encrypt, dh_decrypt, elgamal_encrypt, elgamal_decrypt, power
+from modernCiphers import des_encrypt, des_decrypt, tdes_encrypt, tdes_decrypt, rc4_encrypt, rc4_decrypt, aes_encrypt, aes_decrypt, otp_decrypt, otp_encrypt, setCustomKeys, RSA_encrypt, RSA_decrypt, generate_dh_public_key, calculate_shared_secret, dh_encrypt, dh_decrypt, elgamal_encrypt, elgamal_decrypt, power
 
 # This is the list of libraries we will use for the ciphers
 libraries=[
@@ -20,6 +20,7 @@ libraries=[
     "Coincidence_index",
     "One-Time Pad",
     "DES",
+    "3DES",
     "AES (128)",
     "RC4",
     "RSA (2048)",
@@ -174,6 +175,12 @@ class CipherApp(QtWidgets.QWidget):
             self.pubInput.setEnabled(False)
             self.prvInput.setEnabled(True)
             self.decryptInput.setEnabled(True)
+        elif cipher == "3DES":
+            self.prvInput.setPlaceholderText("Enter key (16 or 24 bytes, as hex)")
+            self.pubInput.setPlaceholderText("")
+            self.pubInput.setEnabled(False)
+            self.prvInput.setEnabled(True)
+            self.decryptInput.setEnabled(True)
         elif cipher == "RC4":
             self.prvInput.setPlaceholderText("Enter key (any length)")
             self.pubInput.setPlaceholderText("")
@@ -339,6 +346,27 @@ class CipherApp(QtWidgets.QWidget):
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "DES Error", f"DES operation failed: {str(e)}")
                 print(f"DES Error: {e}")
+        elif cipher == "3DES":
+            if not re.fullmatch(r'[0-9A-Fa-f]{32}|[0-9A-Fa-f]{48}', prv_key):
+                QtWidgets.QMessageBox.warning(self, "Input Error", "3DES key must be 32 or 48 hex characters (two or three DES keys)")
+                return
+    
+            try:
+                if encrypt_text:
+                    ciphertext = tdes_encrypt(encrypt_text, prv_key.upper())
+                    self.decryptInput.setPlainText(ciphertext)
+        
+                if decrypt_text:
+                    if not re.fullmatch(r'[0-9A-Fa-f]*', decrypt_text) or len(decrypt_text) % 16 != 0:
+                        QtWidgets.QMessageBox.warning(self, "Input Error", "3DES decrypt input must be valid hex string with length multiple of 16")
+                        return
+                
+                    decrypted_text = tdes_decrypt(decrypt_text.upper(), prv_key.upper())
+                    self.encryptInput.setPlainText(decrypted_text)
+            
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "3DES Error", f"3DES operation failed: {str(e)}")
+                print(f"3DES Error: {e}")
         elif cipher == "RC4":
             if len(prv_key) < 1:
                 QtWidgets.QMessageBox.warning(self, "Input Error", "RC4 key must be at least 1 character long")
@@ -1,14 +1,35 @@
 import base64
+import mmap
 import os
-from hashlib import pbkdf2_hmac
+import struct
+import tempfile
+from array import array
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from hashlib import pbkdf2_hmac, sha256
 from hmac import new as new_hmac, compare_digest
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the 'numpy' engine needs it
+    np = None
+
 # AES Constants
-AES_KEY_SIZE = 16  # 128-bit key
+AES_KEY_SIZE = 16  # 128-bit key by default
+AES_ROUNDS = {16: 10, 24: 12, 32: 14}  # key size in bytes -> number of rounds
 HMAC_KEY_SIZE = 16
 IV_SIZE = 16
 SALT_SIZE = 16
 HMAC_SIZE = 32
+GCM_NONCE_SIZE = 12
+GCM_TAG_SIZE = 16
+CTR_BATCH_BLOCKS = 1 << 14  # counter blocks per vectorized batch (256 KiB of keystream)
+STREAM_CHUNK_SIZE = 1 << 20  # bytes read per chunk by the streaming helpers
+KEY_CACHE_SIZE = 128  # default number of derived keys kept by KeyCache
+PARALLEL_MIN_SIZE = 1 << 20  # below this, process start-up costs more than it saves
 
 # Generate S-box for AES
 def gf256_inv(x):
@@ -156,14 +177,275 @@ def inv_mix_columns(state):
         state[i][3] ^= v
     mix_columns(state)
 
-class AES:
+# T-tables for the word-oriented engine
+# The state is laid out as in bytes2matrix: each row of the matrix is one
+# big-endian 32-bit word. shift_rows rotates the bytes inside each word and
+# mix_columns mixes each word on its own, so one lookup per byte fuses
+# sub_bytes and mix_columns, and the rotation becomes a choice of which byte
+# feeds which table.
+def gf256_mul(a, b):
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = xtime(a)
+        b >>= 1
+    return result
+
+def ror32(word, bits):
+    return ((word >> bits) | (word << (32 - bits))) & 0xFFFFFFFF
+
+def generate_ttables(sbox, coefficients):
+    c0, c1, c2, c3 = coefficients
+    t0 = []
+    for i in range(256):
+        s = sbox[i]
+        t0.append((gf256_mul(s, c0) << 24) | (gf256_mul(s, c1) << 16) |
+                  (gf256_mul(s, c2) << 8) | gf256_mul(s, c3))
+    t1 = [ror32(w, 8) for w in t0]
+    t2 = [ror32(w, 16) for w in t0]
+    t3 = [ror32(w, 24) for w in t0]
+    return t0, t1, t2, t3
+
+def inv_mix_word(word):
+    a0, a1, a2, a3 = word.to_bytes(4, 'big')
+    return int.from_bytes(bytes((
+        gf256_mul(a0, 14) ^ gf256_mul(a1, 11) ^ gf256_mul(a2, 13) ^ gf256_mul(a3, 9),
+        gf256_mul(a0, 9) ^ gf256_mul(a1, 14) ^ gf256_mul(a2, 11) ^ gf256_mul(a3, 13),
+        gf256_mul(a0, 13) ^ gf256_mul(a1, 9) ^ gf256_mul(a2, 14) ^ gf256_mul(a3, 11),
+        gf256_mul(a0, 11) ^ gf256_mul(a1, 13) ^ gf256_mul(a2, 9) ^ gf256_mul(a3, 14),
+    )), 'big')
+
+Te0, Te1, Te2, Te3 = generate_ttables(s_box, (2, 1, 1, 3))
+Td0, Td1, Td2, Td3 = generate_ttables(inv_s_box, (14, 9, 13, 11))
+
+def encrypt_block_ttable(rk, n_rounds, plaintext):
+    w0, w1, w2, w3 = struct.unpack('>4I', plaintext)
+    w0 ^= rk[0]
+    w1 ^= rk[1]
+    w2 ^= rk[2]
+    w3 ^= rk[3]
+
+    for r in range(4, 4 * n_rounds, 4):
+        w0, w1, w2, w3 = (
+            Te0[w0 >> 24] ^ Te1[(w0 >> 16) & 0xFF] ^ Te2[(w0 >> 8) & 0xFF] ^ Te3[w0 & 0xFF] ^ rk[r],
+            Te0[(w1 >> 16) & 0xFF] ^ Te1[(w1 >> 8) & 0xFF] ^ Te2[w1 & 0xFF] ^ Te3[w1 >> 24] ^ rk[r + 1],
+            Te0[(w2 >> 8) & 0xFF] ^ Te1[w2 & 0xFF] ^ Te2[w2 >> 24] ^ Te3[(w2 >> 16) & 0xFF] ^ rk[r + 2],
+            Te0[w3 & 0xFF] ^ Te1[w3 >> 24] ^ Te2[(w3 >> 16) & 0xFF] ^ Te3[(w3 >> 8) & 0xFF] ^ rk[r + 3],
+        )
+
+    r = 4 * n_rounds
+    return struct.pack(
+        '>4I',
+        ((s_box[w0 >> 24] << 24) | (s_box[(w0 >> 16) & 0xFF] << 16) |
+         (s_box[(w0 >> 8) & 0xFF] << 8) | s_box[w0 & 0xFF]) ^ rk[r],
+        ((s_box[(w1 >> 16) & 0xFF] << 24) | (s_box[(w1 >> 8) & 0xFF] << 16) |
+         (s_box[w1 & 0xFF] << 8) | s_box[w1 >> 24]) ^ rk[r + 1],
+        ((s_box[(w2 >> 8) & 0xFF] << 24) | (s_box[w2 & 0xFF] << 16) |
+         (s_box[w2 >> 24] << 8) | s_box[(w2 >> 16) & 0xFF]) ^ rk[r + 2],
+        ((s_box[w3 & 0xFF] << 24) | (s_box[w3 >> 24] << 16) |
+         (s_box[(w3 >> 16) & 0xFF] << 8) | s_box[(w3 >> 8) & 0xFF]) ^ rk[r + 3],
+    )
+
+def decrypt_block_ttable(rk, n_rounds, ciphertext):
+    r = 4 * n_rounds
+    w0, w1, w2, w3 = struct.unpack('>4I', ciphertext)
+    w0 ^= rk[r]
+    w1 ^= rk[r + 1]
+    w2 ^= rk[r + 2]
+    w3 ^= rk[r + 3]
+
+    for r in range(4 * (n_rounds - 1), 0, -4):
+        w0, w1, w2, w3 = (
+            Td0[w0 >> 24] ^ Td1[(w0 >> 16) & 0xFF] ^ Td2[(w0 >> 8) & 0xFF] ^ Td3[w0 & 0xFF] ^ rk[r],
+            Td0[w1 & 0xFF] ^ Td1[w1 >> 24] ^ Td2[(w1 >> 16) & 0xFF] ^ Td3[(w1 >> 8) & 0xFF] ^ rk[r + 1],
+            Td0[(w2 >> 8) & 0xFF] ^ Td1[w2 & 0xFF] ^ Td2[w2 >> 24] ^ Td3[(w2 >> 16) & 0xFF] ^ rk[r + 2],
+            Td0[(w3 >> 16) & 0xFF] ^ Td1[(w3 >> 8) & 0xFF] ^ Td2[w3 & 0xFF] ^ Td3[w3 >> 24] ^ rk[r + 3],
+        )
+
+    return struct.pack(
+        '>4I',
+        ((inv_s_box[w0 >> 24] << 24) | (inv_s_box[(w0 >> 16) & 0xFF] << 16) |
+         (inv_s_box[(w0 >> 8) & 0xFF] << 8) | inv_s_box[w0 & 0xFF]) ^ rk[0],
+        ((inv_s_box[w1 & 0xFF] << 24) | (inv_s_box[w1 >> 24] << 16) |
+         (inv_s_box[(w1 >> 16) & 0xFF] << 8) | inv_s_box[(w1 >> 8) & 0xFF]) ^ rk[1],
+        ((inv_s_box[(w2 >> 8) & 0xFF] << 24) | (inv_s_box[w2 & 0xFF] << 16) |
+         (inv_s_box[w2 >> 24] << 8) | inv_s_box[(w2 >> 16) & 0xFF]) ^ rk[2],
+        ((inv_s_box[(w3 >> 16) & 0xFF] << 24) | (inv_s_box[(w3 >> 8) & 0xFF] << 16) |
+         (inv_s_box[w3 & 0xFF] << 8) | inv_s_box[w3 >> 24]) ^ rk[3],
+    )
+
+# Batched CTR keystream (numpy engine)
+if np is not None:
+    _Te = np.array([Te0, Te1, Te2, Te3], dtype=np.uint32)
+    _s_box_np = np.array(s_box, dtype=np.uint32)
+    _BYTE_SHIFTS = np.array([24, 16, 8, 0], dtype=np.uint32)
+    _WORDS = np.arange(4)
+    # _ROTATIONS[k][i] is the byte of word i that feeds table k after shift_rows
+    _ROTATIONS = [(_WORDS + k) % 4 for k in range(4)]
+
+def ctr_counter_blocks(iv, first_block, n_blocks):
+    """Return counter blocks iv + first_block ... as an (n_blocks, 16) uint8 array"""
+    start = (int.from_bytes(iv, 'big') + first_block) % (1 << 128)
+    low_start = np.uint64(start & 0xFFFFFFFFFFFFFFFF)
+    low = np.arange(n_blocks, dtype=np.uint64) + low_start
+    high = np.full(n_blocks, start >> 64, dtype=np.uint64) + (low < low_start)
+
+    blocks = np.empty((n_blocks, 2), dtype='>u8')
+    blocks[:, 0] = high
+    blocks[:, 1] = low
+    return blocks.view(np.uint8)
+
+def ctr_keystream_numpy(round_keys, n_rounds, counter_blocks):
+    """Encrypt an (N, 16) uint8 array of counter blocks, all rounds at once"""
+    state = counter_blocks.view('>u4').astype(np.uint32) ^ round_keys[0]
+
+    for r in range(1, n_rounds):
+        idx = (state[:, :, None] >> _BYTE_SHIFTS) & 0xFF
+        state = (_Te[0][idx[:, _WORDS, _ROTATIONS[0]]] ^ _Te[1][idx[:, _WORDS, _ROTATIONS[1]]] ^
+                 _Te[2][idx[:, _WORDS, _ROTATIONS[2]]] ^ _Te[3][idx[:, _WORDS, _ROTATIONS[3]]] ^
+                 round_keys[r])
+
+    idx = (state[:, :, None] >> _BYTE_SHIFTS) & 0xFF
+    state = ((_s_box_np[idx[:, _WORDS, _ROTATIONS[0]]] << 24) | (_s_box_np[idx[:, _WORDS, _ROTATIONS[1]]] << 16) |
+             (_s_box_np[idx[:, _WORDS, _ROTATIONS[2]]] << 8) | _s_box_np[idx[:, _WORDS, _ROTATIONS[3]]])
+    state ^= round_keys[n_rounds]
+    return state.astype('>u4', order='C').view(np.uint8).reshape(-1, 16)
+
+def ctr_xor_numpy(round_keys, n_rounds, iv, first_block, src, dst):
+    """XOR src with the CTR keystream starting at block first_block into dst ((N, 16) uint8 arrays)"""
+    for start in range(0, len(src), CTR_BATCH_BLOCKS):
+        stop = min(start + CTR_BATCH_BLOCKS, len(src))
+        counters = ctr_counter_blocks(iv, first_block + start, stop - start)
+        keystream = ctr_keystream_numpy(round_keys, n_rounds, counters)
+        np.bitwise_xor(src[start:stop], keystream, out=dst[start:stop])
+
+def ctr_xor_ttable(round_words, n_rounds, iv, first_block, src, dst):
+    """Block-by-block counterpart of ctr_xor_numpy for bytes-like src and writable dst"""
+    counter = int.from_bytes(iv, 'big') + first_block
+    for offset in range(0, len(src), 16):
+        keystream = encrypt_block_ttable(round_words, n_rounds, (counter % (1 << 128)).to_bytes(16, 'big'))
+        block = int.from_bytes(src[offset:offset + 16], 'big') ^ int.from_bytes(keystream, 'big')
+        dst[offset:offset + 16] = block.to_bytes(16, 'big')
+        counter += 1
+
+# Parallel CTR worker: runs in a child process over one counter-aligned slice
+# of the shared input buffer and writes the result into the shared output buffer
+def _ctr_parallel_worker(round_words, n_rounds, iv, in_name, out_name, start, stop):
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        if np is not None:
+            src = np.ndarray((stop - start) // 16, dtype=(np.uint8, 16), buffer=shm_in.buf, offset=start)
+            dst = np.ndarray((stop - start) // 16, dtype=(np.uint8, 16), buffer=shm_out.buf, offset=start)
+            round_keys = np.array(round_words, dtype=np.uint32).reshape(-1, 4)
+            ctr_xor_numpy(round_keys, n_rounds, iv, start // 16, src, dst)
+        else:
+            src = shm_in.buf[start:stop]
+            dst = shm_out.buf[start:stop]
+            ctr_xor_ttable(round_words, n_rounds, iv, start // 16, src, dst)
+            src.release()
+            dst.release()
+        del src, dst
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+ENGINES = ('numpy', 'ttable', 'reference')
+DEFAULT_ENGINE = 'numpy' if np is not None else 'ttable'
+
+def sub_word(word):
+    return ((s_box[word >> 24] << 24) | (s_box[(word >> 16) & 0xFF] << 16) |
+            (s_box[(word >> 8) & 0xFF] << 8) | s_box[word & 0xFF])
+
+def expand_key_words(master_key, n_rounds):
+    """Integer-word version of AES._expand_key: returns 4 * (n_rounds + 1) round-key words"""
+    iteration_size = len(master_key) // 4
+    words = list(struct.unpack(f'>{iteration_size}I', master_key))
+
+    i = 1
+    while len(words) < (n_rounds + 1) * 4:
+        word = words[-1]
+
+        if len(words) % iteration_size == 0:
+            word = sub_word(((word << 8) | (word >> 24)) & 0xFFFFFFFF) ^ (r_con[i] << 24)
+            i += 1
+        elif iteration_size > 6 and len(words) % iteration_size == 4:
+            word = sub_word(word)
+
+        words.append(word ^ words[-iteration_size])
+
+    return words
+
+class AESKey:
+    """
+    Expanded AES key schedule, held as flat array('I') round-key words.
+    Build it once per key and pass it to AES() as many times as needed:
+    instances created from an AESKey share its schedule instead of
+    re-running key expansion.
+    """
     def __init__(self, master_key):
-        # Force AES-128 (16-byte key)
-        if len(master_key) != 16:
-            raise ValueError("AES-128 requires exactly 16 bytes (128 bits) key")
-        
-        self.n_rounds = 10  # AES-128 uses 10 rounds
-        self._key_matrices = self._expand_key(master_key)
+        # AES-128, AES-192 or AES-256
+        if len(master_key) not in AES_ROUNDS:
+            raise ValueError("AES requires a 16, 24 or 32 bytes (128, 192 or 256 bits) key")
+
+        self.n_rounds = AES_ROUNDS[len(master_key)]
+        enc_words = expand_key_words(bytes(master_key), self.n_rounds)
+        self.enc_words = array('I', enc_words)
+        self.dec_words = array('I', enc_words[:4] + [inv_mix_word(w) for w in enc_words[4:-4]] + enc_words[-4:])
+        self.hmac_key = None
+        self.iv = None
+
+    @classmethod
+    def from_password(cls, password, salt, workload=100000, key_size=AES_KEY_SIZE):
+        """Derive the key with get_key_iv; the matching hmac_key and iv are kept as attributes"""
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        aes_key, hmac_key, iv = get_key_iv(password, salt, workload, key_size)
+        key = cls(aes_key)
+        key.hmac_key = hmac_key
+        key.iv = iv
+        return key
+
+    def copy(self):
+        """Independent copy of the schedule (wiping one does not affect the other)"""
+        key = object.__new__(type(self))
+        key.n_rounds = self.n_rounds
+        key.enc_words = array('I', self.enc_words)
+        key.dec_words = array('I', self.dec_words)
+        key.hmac_key = self.hmac_key
+        key.iv = self.iv
+        return key
+
+    def round_keys_np(self):
+        """The encryption schedule as an (n_rounds + 1, 4) uint32 view, for the numpy engine"""
+        return np.frombuffer(self.enc_words, dtype=np.uint32).reshape(-1, 4)
+
+    def wipe(self):
+        """Overwrite the schedule in place; every AES built from this key becomes unusable"""
+        for words in (self.enc_words, self.dec_words):
+            memoryview(words).cast('B')[:] = bytes(len(words) * words.itemsize)
+
+class AES:
+    def __init__(self, master_key, engine=DEFAULT_ENGINE):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown AES engine '{engine}', expected one of {ENGINES}")
+        if engine == 'numpy' and np is None:
+            raise ValueError("The 'numpy' AES engine requires numpy to be installed")
+
+        self.key = master_key if isinstance(master_key, AESKey) else AESKey(master_key)
+        self.n_rounds = self.key.n_rounds
+        self.engine = engine
+        self._enc_words = self.key.enc_words
+        self._dec_words = self.key.dec_words
+        if engine == 'numpy':
+            self._round_keys_np = self.key.round_keys_np()
+        elif engine == 'reference':
+            if isinstance(master_key, AESKey):
+                self._key_matrices = [[list(w.to_bytes(4, 'big')) for w in self._enc_words[i:i + 4]]
+                                      for i in range(0, len(self._enc_words), 4)]
+            else:
+                self._key_matrices = self._expand_key(master_key)
 
     def _expand_key(self, master_key):
         key_columns = bytes2matrix(master_key)
@@ -178,6 +460,9 @@ class AES:
                 word = [s_box[b] for b in word]
                 word[0] ^= r_con[i]
                 i += 1
+            elif iteration_size > 6 and len(key_columns) % iteration_size == 4:
+                # AES-256 has an extra SubWord in the middle of each iteration
+                word = [s_box[b] for b in word]
 
             word = XORbytes(word, key_columns[-iteration_size])
             key_columns.append(word)
@@ -187,7 +472,19 @@ class AES:
     def encrypt_block(self, plaintext):
         if len(plaintext) != 16:
             raise ValueError("Block must be exactly 16 bytes")
+        if self.engine != 'reference':
+            return encrypt_block_ttable(self._enc_words, self.n_rounds, plaintext)
+        return self._encrypt_block_reference(plaintext)
+
+    def decrypt_block(self, ciphertext):
+        if len(ciphertext) != 16:
+            raise ValueError("Block must be exactly 16 bytes")
+        if self.engine != 'reference':
+            return decrypt_block_ttable(self._dec_words, self.n_rounds, ciphertext)
+        return self._decrypt_block_reference(ciphertext)
 
+    # Reference implementation, kept for cross-checking the T-table engine
+    def _encrypt_block_reference(self, plaintext):
         plain_state = bytes2matrix(plaintext)
         add_round_key(plain_state, self._key_matrices[0])
 
@@ -203,10 +500,7 @@ class AES:
 
         return matrix2bytes(plain_state)
 
-    def decrypt_block(self, ciphertext):
-        if len(ciphertext) != 16:
-            raise ValueError("Block must be exactly 16 bytes")
-
+    def _decrypt_block_reference(self, ciphertext):
         cipher_state = bytes2matrix(ciphertext)
         add_round_key(cipher_state, self._key_matrices[-1])
         inv_shift_rows(cipher_state)
@@ -221,47 +515,214 @@ class AES:
         add_round_key(cipher_state, self._key_matrices[0])
         return matrix2bytes(cipher_state)
     
-    def encrypt_ctr(self, plaintext, iv):
+    def _xor_ctr_parallel(self, data, iv, workers, padded=False):
+        # With padded=True the PKCS7 padding is written straight into the
+        # shared input buffer, so the plaintext is copied only once
+        src = memoryview(data).cast('B')
+        if not padded and len(src) % 16 != 0:
+            raise ValueError(f"Message length {len(src)} is not a multiple of block size 16")
+        size = len(src) - len(src) % 16 + 16 if padded else len(src)
+
+        workers = workers or os.cpu_count() or 1
+        n_blocks = size // 16
+        if workers <= 1 or size < PARALLEL_MIN_SIZE:
+            return self.encrypt_ctr(src, iv) if padded else self.decrypt_ctr(src, iv)
+
+        shm_in = shared_memory.SharedMemory(create=True, size=size)
+        shm_out = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            shm_in.buf[:len(src)] = src
+            if padded:
+                padding_len = size - len(src)
+                shm_in.buf[len(src):size] = bytes([padding_len] * padding_len)
+            blocks_per_worker = -(-n_blocks // workers)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_ctr_parallel_worker, self._enc_words, self.n_rounds, iv,
+                                shm_in.name, shm_out.name, 16 * first, 16 * min(first + blocks_per_worker, n_blocks))
+                    for first in range(0, n_blocks, blocks_per_worker)
+                ]
+                for future in futures:
+                    future.result()
+            return bytes(shm_out.buf[:size])
+        finally:
+            shm_in.close()
+            shm_in.unlink()
+            shm_out.close()
+            shm_out.unlink()
+
+    def encrypt_ctr(self, plaintext, iv, out=None):
+        """
+        Pad and encrypt plaintext (any buffer). With out (a writable buffer
+        of len(pad(plaintext)) bytes) the ciphertext is written there in place
+        and out is returned; only the final padded block is copied.
+        """
         if len(iv) != 16:
             raise ValueError("IV must be exactly 16 bytes")
 
-        blocks = []
-        nonce = iv
-        padded_plaintext = pad(plaintext)
-        
-        for plaintext_block in split_blocks(padded_plaintext, require_padding=False):
-            block = XORbytes(plaintext_block, self.encrypt_block(nonce))
-            blocks.append(block)
-            nonce = incBytes(nonce)
+        src = memoryview(plaintext).cast('B')
+        full = len(src) - len(src) % 16
+        result = bytearray(full + 16) if out is None else out
+        dst = memoryview(result).cast('B')
+        if len(dst) != full + 16:
+            raise ValueError(f"Output buffer must be {full + 16} bytes, got {len(dst)}")
 
-        return b''.join(blocks)
+        self.xor_ctr(src[:full], iv, out=dst[:full])
+        self.xor_ctr(pad(src[full:].tobytes()), iv, full // 16, out=dst[full:])
+        return out if out is not None else bytes(result)
 
-    def decrypt_ctr(self, ciphertext, iv):
+    def decrypt_ctr(self, ciphertext, iv, out=None):
+        return self.xor_ctr(ciphertext, iv, out=out)
+
+    def xor_ctr(self, data, iv, first_block=0, out=None):
+        """
+        XOR block-aligned data (bytes, bytearray, memoryview, mmap...) with the
+        CTR keystream, starting from counter block iv + first_block. Lets a long
+        message be processed in chunks by carrying first_block across calls.
+        If out is a writable buffer of the same length the result is written
+        into it in place and out is returned, otherwise new bytes are returned.
+        """
         if len(iv) != 16:
             raise ValueError("IV must be exactly 16 bytes")
 
-        blocks = []
-        nonce = iv
-        
-        for ciphertext_block in split_blocks(ciphertext, require_padding=False):
-            block = XORbytes(ciphertext_block, self.encrypt_block(nonce))
-            blocks.append(block)
-            nonce = incBytes(nonce)
+        src = memoryview(data).cast('B')
+        if len(src) % 16 != 0:
+            raise ValueError(f"Message length {len(src)} is not a multiple of block size 16")
+        result = bytearray(len(src)) if out is None else out
+        dst = memoryview(result).cast('B')
+        if len(dst) != len(src):
+            raise ValueError(f"Output buffer must be {len(src)} bytes, got {len(dst)}")
 
-        return b''.join(blocks)
+        if self.engine == 'numpy':
+            ctr_xor_numpy(self._round_keys_np, self.n_rounds, iv, first_block,
+                          np.frombuffer(src, dtype=np.uint8).reshape(-1, 16),
+                          np.frombuffer(dst, dtype=np.uint8).reshape(-1, 16))
+        else:
+            counter = int.from_bytes(iv, 'big') + first_block
+            for offset in range(0, len(src), 16):
+                keystream = self.encrypt_block((counter % (1 << 128)).to_bytes(16, 'big'))
+                block = int.from_bytes(src[offset:offset + 16], 'big') ^ int.from_bytes(keystream, 'big')
+                dst[offset:offset + 16] = block.to_bytes(16, 'big')
+                counter += 1
+
+        return out if out is not None else bytes(result)
+
+    def encrypt_ctr_parallel(self, plaintext, iv, workers=None):
+        """
+        Same output as encrypt_ctr, with the counter blocks split across a
+        process pool of `workers` processes (defaults to the CPU count).
+        plaintext may be any buffer; it is copied once into shared memory
+        and padded there.
+        """
+        if len(iv) != 16:
+            raise ValueError("IV must be exactly 16 bytes")
+        return self._xor_ctr_parallel(plaintext, iv, workers, padded=True)
+
+    def decrypt_ctr_parallel(self, ciphertext, iv, workers=None):
+        """Same output as decrypt_ctr, computed across a process pool"""
+        if len(iv) != 16:
+            raise ValueError("IV must be exactly 16 bytes")
+        return self._xor_ctr_parallel(ciphertext, iv, workers)
+
+    def wipe(self):
+        """Overwrite the expanded key schedule in place (see AESKey.wipe)"""
+        self.key.wipe()
+        for round_key in getattr(self, '_key_matrices', ()):
+            for column in round_key:
+                if isinstance(column, list):
+                    column[:] = [0] * len(column)
 
 # Key derivation function
-def get_key_iv(password, salt, workload=100000):
-    stretched = pbkdf2_hmac('sha256', password, salt, workload, AES_KEY_SIZE + IV_SIZE + HMAC_KEY_SIZE)
-    aes_key, stretched = stretched[:AES_KEY_SIZE], stretched[AES_KEY_SIZE:]
+def get_key_iv(password, salt, workload=100000, key_size=AES_KEY_SIZE):
+    if key_size not in AES_ROUNDS:
+        raise ValueError(f"Unsupported AES key size {key_size}, expected 16, 24 or 32 bytes")
+    stretched = pbkdf2_hmac('sha256', password, salt, workload, key_size + IV_SIZE + HMAC_KEY_SIZE)
+    aes_key, stretched = stretched[:key_size], stretched[key_size:]
     hmac_key, stretched = stretched[:HMAC_KEY_SIZE], stretched[HMAC_KEY_SIZE:]
     iv = stretched[:IV_SIZE]
     return aes_key, hmac_key, iv
 
+class KeyCache:
+    """
+    Opt-in bounded LRU cache for get_key_iv, so records sharing a password
+    and salt only pay for PBKDF2 and key expansion once. Entries are keyed on
+    (SHA-256 of the password, salt, workload, key size) and hold the derived keys plus
+    the expanded AESKey schedule. Callers get a private copy of the AESKey, so
+    they may wipe it freely; evicted entries (derived keys and the cache's own
+    schedule) are zeroed.
+    """
+    def __init__(self, maxsize=KEY_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(password, salt, workload, key_size):
+        return sha256(password).digest(), bytes(salt), workload, key_size
+
+    @staticmethod
+    def _wipe(entry):
+        aes_key, hmac_key, iv, key = entry
+        for secret in (aes_key, hmac_key, iv):
+            secret[:] = bytes(len(secret))
+        key.wipe()
+
+    def get(self, password, salt, workload=100000, key_size=AES_KEY_SIZE):
+        """Return (aes_key, hmac_key, iv, AESKey), deriving and caching them on a miss"""
+        cache_key = self._cache_key(password, salt, workload, key_size)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                aes_key, hmac_key, iv, key = entry
+                return bytes(aes_key), bytes(hmac_key), bytes(iv), key.copy()
+
+        aes_key, hmac_key, iv = get_key_iv(password, salt, workload, key_size)
+        entry = (bytearray(aes_key), bytearray(hmac_key), bytearray(iv), AESKey(aes_key))
+        with self._lock:
+            if cache_key in self._entries:
+                self._wipe(entry)
+                entry = self._entries[cache_key]
+            else:
+                self._entries[cache_key] = entry
+                while len(self._entries) > self.maxsize:
+                    self._wipe(self._entries.popitem(last=False)[1])
+            aes_key, hmac_key, iv, key = entry
+            return bytes(aes_key), bytes(hmac_key), bytes(iv), key.copy()
+
+    def evict(self, password, salt, workload=100000, key_size=AES_KEY_SIZE):
+        """Drop and zero one entry; returns False if it was not cached"""
+        with self._lock:
+            entry = self._entries.pop(self._cache_key(password, salt, workload, key_size), None)
+        if entry is None:
+            return False
+        self._wipe(entry)
+        return True
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._wipe(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+def _derive(password, salt, key_cache, key_size):
+    if key_cache is None:
+        aes_key, hmac_key, iv = get_key_iv(password, salt, key_size=key_size)
+        return aes_key, hmac_key, iv, AES(aes_key)
+    aes_key, hmac_key, iv, key = key_cache.get(password, salt, key_size=key_size)
+    return aes_key, hmac_key, iv, AES(key)
+
 # Main encryption function (exported)
-def aes_encrypt(plaintext, password):
+def aes_encrypt(plaintext, password, key_size=AES_KEY_SIZE):
     """
-    Encrypt plaintext using AES-128 in CTR mode with HMAC authentication.
+    Encrypt plaintext using AES in CTR mode with HMAC authentication.
+    key_size selects AES-128 (16, default), AES-192 (24) or AES-256 (32).
     Returns base64 encoded result.
     """
     try:
@@ -275,16 +736,18 @@ def aes_encrypt(plaintext, password):
         salt = os.urandom(SALT_SIZE)
         
         # Derive keys and IV
-        aes_key, hmac_key, iv = get_key_iv(password, salt)
+        aes_key, hmac_key, iv = get_key_iv(password, salt, key_size=key_size)
         
-        # Encrypt using AES-128 CTR mode
-        ciphertext = AES(aes_key).encrypt_ctr(plaintext, iv)
+        # Lay out HMAC + salt + ciphertext in one buffer
+        encrypted_data = bytearray(HMAC_SIZE + SALT_SIZE + len(plaintext) - len(plaintext) % 16 + 16)
+        view = memoryview(encrypted_data)
+        view[HMAC_SIZE:HMAC_SIZE + SALT_SIZE] = salt
         
-        # Create HMAC for authentication
-        hmac = new_hmac(hmac_key, salt + ciphertext, 'sha256').digest()
+        # Encrypt using AES CTR mode, straight into the output buffer
+        AES(aes_key).encrypt_ctr(plaintext, iv, out=view[HMAC_SIZE + SALT_SIZE:])
         
-        # Combine HMAC + salt + ciphertext
-        encrypted_data = hmac + salt + ciphertext
+        # Create HMAC for authentication over salt + ciphertext
+        view[:HMAC_SIZE] = new_hmac(hmac_key, view[HMAC_SIZE:], 'sha256').digest()
         
         # Return base64 encoded result
         return base64.b64encode(encrypted_data).decode('utf-8')
@@ -293,10 +756,11 @@ def aes_encrypt(plaintext, password):
         return f"Encryption Error: {str(e)}"
 
 # Main decryption function (exported)
-def aes_decrypt(encrypted_data_base64, password):
+def aes_decrypt(encrypted_data_base64, password, key_cache=None, key_size=AES_KEY_SIZE):
     """
-    Decrypt base64 encoded AES-128 encrypted data.
+    Decrypt base64 encoded AES encrypted data; key_size must match the one used to encrypt.
     Verifies HMAC before decryption.
+    Pass a KeyCache to reuse derived keys across calls with the same password and salt.
     """
     try:
         # Convert password to bytes if it's a string
@@ -304,27 +768,27 @@ def aes_decrypt(encrypted_data_base64, password):
             password = password.encode('utf-8')
         
         # Decode base64
-        encrypted_data = base64.b64decode(encrypted_data_base64)
+        encrypted_data = memoryview(base64.b64decode(encrypted_data_base64))
         
         # Ensure the data is long enough to contain HMAC, salt, and ciphertext
         if len(encrypted_data) < (SALT_SIZE + HMAC_SIZE):
             raise ValueError("Encrypted data is too short to contain HMAC and salt.")
         
-        # Extract components
+        # Extract components (views, not copies)
         hmac = encrypted_data[:HMAC_SIZE]
-        salt = encrypted_data[HMAC_SIZE:HMAC_SIZE + SALT_SIZE]
+        salt = bytes(encrypted_data[HMAC_SIZE:HMAC_SIZE + SALT_SIZE])
         ciphertext = encrypted_data[HMAC_SIZE + SALT_SIZE:]
         
         # Derive keys and IV
-        aes_key, hmac_key, iv = get_key_iv(password, salt)
+        aes_key, hmac_key, iv, cipher = _derive(password, salt, key_cache, key_size)
         
         # Verify HMAC
-        expected_hmac = new_hmac(hmac_key, salt + ciphertext, 'sha256').digest()
+        expected_hmac = new_hmac(hmac_key, encrypted_data[HMAC_SIZE:], 'sha256').digest()
         if not compare_digest(hmac, expected_hmac):
             raise ValueError("HMAC verification failed: Data may have been tampered with or wrong password.")
         
-        # Decrypt using AES-128 CTR mode
-        decrypted_data = AES(aes_key).decrypt_ctr(ciphertext, iv)
+        # Decrypt using AES CTR mode
+        decrypted_data = cipher.decrypt_ctr(ciphertext, iv)
         
         # Remove padding
         plaintext = unpad(decrypted_data)
@@ -333,4 +797,453 @@ def aes_decrypt(encrypted_data_base64, password):
         return plaintext.decode('utf-8')
         
     except Exception as e:
-        raise ValueError(f"Decryption Error: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Decryption Error: {str(e)}")
+
+# Streaming helpers
+def _read_full(src, size):
+    """Read exactly size bytes from src unless it hits EOF first"""
+    chunks = []
+    while size > 0:
+        chunk = src.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+def _stream_chunk_size(chunk_size):
+    # Multiple of 48 so chunks stay aligned to both AES blocks and base64 groups
+    return max(48, chunk_size - chunk_size % 48)
+
+def aes_encrypt_stream(src, dst, password, chunk_size=STREAM_CHUNK_SIZE, base64_framing=False,
+                       key_size=AES_KEY_SIZE):
+    """
+    Encrypt the binary file object src into dst with bounded memory.
+    The output has the same layout as aes_encrypt (HMAC + salt + ciphertext),
+    raw by default or as the same base64 text with base64_framing=True.
+    dst must be seekable: the HMAC is written into the space reserved for it
+    once the whole ciphertext has been authenticated.
+    """
+    try:
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        chunk_size = _stream_chunk_size(chunk_size)
+
+        salt = os.urandom(SALT_SIZE)
+        aes_key, hmac_key, iv = get_key_iv(password, salt, key_size=key_size)
+        cipher = AES(aes_key)
+        hmac = new_hmac(hmac_key, salt, 'sha256')
+
+        header_start = dst.tell()
+        header_size = (HMAC_SIZE + SALT_SIZE) * 4 // 3 if base64_framing else HMAC_SIZE + SALT_SIZE
+        dst.write(bytes(header_size))
+
+        first_block = 0
+        chunk = _read_full(src, chunk_size)
+        while True:
+            next_chunk = _read_full(src, chunk_size) if len(chunk) == chunk_size else b''
+            if not next_chunk:
+                chunk = pad(chunk)
+            ciphertext = cipher.xor_ctr(chunk, iv, first_block)
+            hmac.update(ciphertext)
+            dst.write(base64.b64encode(ciphertext) if base64_framing else ciphertext)
+            first_block += len(chunk) // 16
+            if not next_chunk:
+                break
+            chunk = next_chunk
+
+        header = hmac.digest() + salt
+        end = dst.tell()
+        dst.seek(header_start)
+        dst.write(base64.b64encode(header) if base64_framing else header)
+        dst.seek(end)
+
+    except Exception as e:
+        raise ValueError(f"Encryption Error: {str(e)}")
+
+def aes_decrypt_stream(src, dst, password, chunk_size=STREAM_CHUNK_SIZE, base64_framing=False,
+                       key_cache=None, key_size=AES_KEY_SIZE):
+    """
+    Decrypt the output of aes_encrypt_stream (or aes_encrypt, with
+    base64_framing=True) from src into dst with bounded memory.
+    src must be seekable: the HMAC is verified in a first pass and nothing
+    is written to dst unless it matches. Base64 input must not contain line breaks.
+    """
+    try:
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        chunk_size = _stream_chunk_size(chunk_size)
+        read_size = chunk_size * 4 // 3 if base64_framing else chunk_size
+
+        def read_chunk(size):
+            data = _read_full(src, size)
+            return base64.b64decode(data) if base64_framing else data
+
+        header = read_chunk((HMAC_SIZE + SALT_SIZE) * 4 // 3 if base64_framing else HMAC_SIZE + SALT_SIZE)
+        if len(header) < (SALT_SIZE + HMAC_SIZE):
+            raise ValueError("Encrypted data is too short to contain HMAC and salt.")
+        hmac, salt = header[:HMAC_SIZE], header[HMAC_SIZE:]
+        body_start = src.tell()
+
+        aes_key, hmac_key, iv, cipher = _derive(password, salt, key_cache, key_size)
+
+        # First pass: authenticate the whole ciphertext
+        expected_hmac = new_hmac(hmac_key, salt, 'sha256')
+        chunk = read_chunk(read_size)
+        while chunk:
+            expected_hmac.update(chunk)
+            chunk = read_chunk(read_size)
+        if not compare_digest(hmac, expected_hmac.digest()):
+            raise ValueError("HMAC verification failed: Data may have been tampered with or wrong password.")
+
+        # Second pass: decrypt, holding back the last chunk until its padding is removed
+        src.seek(body_start)
+        first_block = 0
+        pending = b''
+        chunk = read_chunk(read_size)
+        while chunk:
+            dst.write(pending)
+            pending = cipher.xor_ctr(chunk, iv, first_block)
+            first_block += len(chunk) // 16
+            chunk = read_chunk(read_size)
+        dst.write(unpad(pending))
+
+    except Exception as e:
+        raise ValueError(f"Decryption Error: {str(e)}")
+
+
+# Memory-mapped file helpers
+# Output is written to a temporary file in the destination directory and only
+# moved over out_path once complete, so a failure never touches an existing
+# out_path and path == out_path cannot truncate the input before it is read.
+def _temp_output(out_path):
+    directory = os.path.dirname(os.path.abspath(out_path))
+    return tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(out_path) + '.', suffix='.tmp')
+
+def aes_encrypt_file(path, out_path, password, key_size=AES_KEY_SIZE):
+    """
+    Encrypt the file at path into out_path (HMAC + salt + ciphertext, raw
+    binary as in aes_encrypt_stream). Both files are memory-mapped and the
+    CTR keystream runs from one mapping straight into the other, so the
+    data is never held on the Python heap. out_path is replaced only on
+    success and may be the same file as path.
+    """
+    tmp_path = None
+    try:
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+
+        salt = os.urandom(SALT_SIZE)
+        aes_key, hmac_key, iv = get_key_iv(password, salt, key_size=key_size)
+        size = os.path.getsize(path)
+        total = HMAC_SIZE + SALT_SIZE + size - size % 16 + 16
+
+        with open(path, 'rb') as src:
+            fd, tmp_path = _temp_output(out_path)
+            with open(fd, 'w+b') as dst:
+                dst.truncate(total)
+                with mmap.mmap(dst.fileno(), total) as out_map:
+                    with memoryview(out_map) as out_view:
+                        out_view[HMAC_SIZE:HMAC_SIZE + SALT_SIZE] = salt
+                        with out_view[HMAC_SIZE + SALT_SIZE:] as ct_view:
+                            if size:
+                                with mmap.mmap(src.fileno(), size, access=mmap.ACCESS_READ) as in_map:
+                                    AES(aes_key).encrypt_ctr(in_map, iv, out=ct_view)
+                            else:
+                                AES(aes_key).encrypt_ctr(b'', iv, out=ct_view)
+                        out_view[:HMAC_SIZE] = new_hmac(hmac_key, out_view[HMAC_SIZE:], 'sha256').digest()
+                    out_map.flush()
+
+        os.replace(tmp_path, out_path)
+
+    except Exception as e:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise ValueError(f"Encryption Error: {str(e)}")
+
+def aes_decrypt_file(path, out_path, password, key_cache=None, key_size=AES_KEY_SIZE):
+    """
+    Decrypt a file produced by aes_encrypt_file (or raw aes_encrypt_stream
+    output) into out_path. The HMAC is checked over the mapped input before
+    the output is written; the output is preallocated, mapped and decrypted
+    into, then truncated to drop the padding. out_path is replaced only on
+    success and may be the same file as path.
+    """
+    tmp_path = None
+    try:
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+
+        size = os.path.getsize(path)
+        if size < (SALT_SIZE + HMAC_SIZE):
+            raise ValueError("Encrypted data is too short to contain HMAC and salt.")
+        length = size - HMAC_SIZE - SALT_SIZE
+        if length == 0 or length % 16 != 0:
+            raise ValueError(f"Ciphertext length {length} is not a positive multiple of block size 16")
+
+        with open(path, 'rb') as src, mmap.mmap(src.fileno(), size, access=mmap.ACCESS_READ) as in_map:
+            with memoryview(in_map) as in_view:
+                hmac = bytes(in_view[:HMAC_SIZE])
+                salt = bytes(in_view[HMAC_SIZE:HMAC_SIZE + SALT_SIZE])
+                aes_key, hmac_key, iv, cipher = _derive(password, salt, key_cache, key_size)
+
+                expected_hmac = new_hmac(hmac_key, in_view[HMAC_SIZE:], 'sha256').digest()
+                if not compare_digest(hmac, expected_hmac):
+                    raise ValueError("HMAC verification failed: Data may have been tampered with or wrong password.")
+
+                fd, tmp_path = _temp_output(out_path)
+                with open(fd, 'w+b') as dst:
+                    dst.truncate(length)
+                    with mmap.mmap(dst.fileno(), length) as out_map:
+                        cipher.decrypt_ctr(in_view[HMAC_SIZE + SALT_SIZE:], iv, out=out_map)
+                        last_block = out_map[length - 16:]
+                        out_map.flush()
+                    dst.truncate(length - 16 + len(unpad(last_block)))
+
+        os.replace(tmp_path, out_path)
+
+    except Exception as e:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise ValueError(f"Decryption Error: {str(e)}")
+
+# GHASH with Shoup's 8-bit tables
+# Blocks are 128-bit big-endian ints in GCM bit order (the most significant
+# bit is the coefficient of x^0), so multiplying by x is a right shift.
+GCM_R = 0xE1 << 120
+
+def gf128_mul_x(v):
+    return (v >> 1) ^ GCM_R if v & 1 else v >> 1
+
+def gf128_mul(x, y):
+    """Bit-by-bit GF(2^128) multiplication, reference for the GHASH tables"""
+    z = 0
+    for i in range(127, -1, -1):
+        if (x >> i) & 1:
+            z ^= y
+        y = gf128_mul_x(y)
+    return z
+
+def generate_ghash_reduction_table():
+    # R8[r]: what the eight bits r shifted out by a multiplication by x^8 fold back into
+    table = []
+    for r in range(256):
+        for _ in range(8):
+            r = gf128_mul_x(r)
+        table.append(r)
+    return table
+
+GHASH_R8 = generate_ghash_reduction_table()
+
+class GHash:
+    def __init__(self, h):
+        # M[b] = b * H for every possible leading byte b
+        m = [0] * 256
+        v = h
+        for bit in (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01):
+            m[bit] = v
+            v = gf128_mul_x(v)
+        for b in range(3, 256):
+            if b & (b - 1):
+                m[b] = m[b & -b] ^ m[b & (b - 1)]
+        self._m = m
+        self._y = 0
+        self._buffer = b''
+
+    def _mul_h(self, x):
+        m = self._m
+        r8 = GHASH_R8
+        z = m[x & 0xFF]
+        for shift in range(8, 128, 8):
+            z = (z >> 8) ^ r8[z & 0xFF] ^ m[(x >> shift) & 0xFF]
+        return z
+
+    def update(self, data):
+        data = self._buffer + bytes(data)
+        full = len(data) - len(data) % 16
+        y = self._y
+        for offset in range(0, full, 16):
+            y = self._mul_h(y ^ int.from_bytes(data[offset:offset + 16], 'big'))
+        self._y = y
+        self._buffer = data[full:]
+
+    def flush(self):
+        """Zero-pad and absorb a pending partial block"""
+        if self._buffer:
+            self.update(bytes(16 - len(self._buffer)))
+
+    def digest(self):
+        self.flush()
+        return self._y.to_bytes(16, 'big')
+
+class GCMContext:
+    """
+    One streaming AES-GCM operation, created by AESGCM.encryptor() or
+    AESGCM.decryptor(). Feed additional data with update_aad() before any
+    update(); finalize() returns the tag (encrypt) or checks it (decrypt).
+    """
+    def __init__(self, gcm, nonce, decrypt):
+        self._cipher = gcm.cipher
+        self._decrypt = decrypt
+        self._ghash = GHash(gcm.h)
+        if len(nonce) == GCM_NONCE_SIZE:
+            j0 = bytes(nonce) + b'\x00\x00\x00\x01'
+        else:
+            iv_hash = GHash(gcm.h)
+            iv_hash.update(nonce)
+            iv_hash.flush()
+            iv_hash.update(bytes(8) + (len(nonce) * 8).to_bytes(8, 'big'))
+            j0 = iv_hash.digest()
+        self._tag_mask = self._cipher.encrypt_block(j0)
+        self._counter = int.from_bytes(j0, 'big')
+        self._keystream = b''
+        self._aad_len = 0
+        self._data_len = 0
+        self._started = False
+        self._finalized = False
+
+    def _next_counter_block(self, n_blocks):
+        # inc32: only the low 32 bits of the counter block are incremented
+        counter = self._counter
+        low = ((counter & 0xFFFFFFFF) + 1) & 0xFFFFFFFF
+        block = ((counter >> 32 << 32) | low).to_bytes(16, 'big')
+        self._counter = (counter >> 32 << 32) | ((low + n_blocks - 1) & 0xFFFFFFFF)
+        return block
+
+    def _gctr(self, data):
+        out = []
+        while data:
+            n_blocks = min(len(data) // 16, (1 << 32) - ((self._counter + 1) & 0xFFFFFFFF))
+            if n_blocks == 0:
+                break
+            first = self._next_counter_block(n_blocks)
+            out.append(self._cipher.xor_ctr(data[:16 * n_blocks], first))
+            data = data[16 * n_blocks:]
+        return b''.join(out)
+
+    def update_aad(self, aad):
+        if self._finalized:
+            raise ValueError("GCM context already finalized")
+        if self._started:
+            raise ValueError("Additional data must be supplied before any update()")
+        self._aad_len += len(aad)
+        self._ghash.update(aad)
+
+    def update(self, data):
+        if self._finalized:
+            raise ValueError("GCM context already finalized")
+        if not self._started:
+            self._ghash.flush()
+            self._started = True
+        data = bytes(data)
+        self._data_len += len(data)
+        if self._decrypt:
+            self._ghash.update(data)
+
+        # Use up keystream left over from a previous partial block first
+        head = min(len(self._keystream), len(data))
+        out = [XORbytes(data[:head], self._keystream[:head])]
+        self._keystream = self._keystream[head:]
+        data = data[head:]
+
+        full = len(data) - len(data) % 16
+        out.append(self._gctr(data[:full]))
+        if full < len(data):
+            block = self._next_counter_block(1)
+            keystream = self._cipher.encrypt_block(block)
+            tail = len(data) - full
+            out.append(XORbytes(data[full:], keystream[:tail]))
+            self._keystream = keystream[tail:]
+
+        result = b''.join(out)
+        if not self._decrypt:
+            self._ghash.update(result)
+        return result
+
+    def finalize(self, tag=None):
+        if self._finalized:
+            raise ValueError("GCM context already finalized")
+        self._finalized = True
+        self._ghash.flush()
+        self._ghash.update((self._aad_len * 8).to_bytes(8, 'big') + (self._data_len * 8).to_bytes(8, 'big'))
+        expected_tag = XORbytes(self._ghash.digest(), self._tag_mask)
+        if not self._decrypt:
+            return expected_tag
+        if tag is None or not compare_digest(bytes(tag), expected_tag):
+            raise ValueError("GCM tag verification failed: Data may have been tampered with or wrong key.")
+        return expected_tag
+
+class AESGCM:
+    """AES in Galois/Counter Mode on top of the AES block encryptor"""
+    def __init__(self, key, engine=DEFAULT_ENGINE):
+        self.cipher = AES(key, engine)
+        self.h = int.from_bytes(self.cipher.encrypt_block(bytes(16)), 'big')
+
+    def encryptor(self, nonce):
+        return GCMContext(self, nonce, decrypt=False)
+
+    def decryptor(self, nonce):
+        return GCMContext(self, nonce, decrypt=True)
+
+    def encrypt(self, nonce, plaintext, aad=b''):
+        """Return ciphertext followed by the 16-byte tag"""
+        context = self.encryptor(nonce)
+        context.update_aad(aad)
+        ciphertext = context.update(plaintext)
+        return ciphertext + context.finalize()
+
+    def decrypt(self, nonce, data, aad=b''):
+        if len(data) < GCM_TAG_SIZE:
+            raise ValueError("Data is too short to contain a GCM tag.")
+        context = self.decryptor(nonce)
+        context.update_aad(aad)
+        plaintext = context.update(data[:-GCM_TAG_SIZE])
+        context.finalize(data[-GCM_TAG_SIZE:])
+        return plaintext
+
+def benchmark_gcm(size=1 << 20, repeat=3):
+    """Compare AES-GCM with the CTR + HMAC-SHA256 construction used by aes_encrypt"""
+    data = os.urandom(size)
+    aes_key, hmac_key, iv = os.urandom(AES_KEY_SIZE), os.urandom(HMAC_KEY_SIZE), os.urandom(IV_SIZE)
+    salt, nonce = os.urandom(SALT_SIZE), os.urandom(GCM_NONCE_SIZE)
+
+    def ctr_hmac():
+        ciphertext = AES(aes_key).encrypt_ctr(data, iv)
+        new_hmac(hmac_key, salt + ciphertext, 'sha256').digest()
+
+    def gcm():
+        AESGCM(aes_key).encrypt(nonce, data, salt)
+
+    results = {}
+    for name, run in (('CTR + HMAC-SHA256', ctr_hmac), ('GCM', gcm)):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        results[name] = size / best / 1e6
+        print(f"{name:<18} {results[name]:8.2f} MB/s")
+    return results
+
+def measure_ctr_peak_allocations(size=8 << 20):
+    """Peak traced allocations of decrypt_ctr returning new bytes vs writing into a caller buffer"""
+    import tracemalloc
+
+    cipher = AES(os.urandom(AES_KEY_SIZE))
+    iv = os.urandom(IV_SIZE)
+    data = bytearray(os.urandom(size))
+    out = bytearray(size)
+
+    peaks = {}
+    for name, run in (('new bytes', lambda: cipher.decrypt_ctr(data, iv)),
+                      ('in place', lambda: cipher.decrypt_ctr(data, iv, out=out))):
+        tracemalloc.start()
+        run()
+        peaks[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:<10} peak {peaks[name] / 1e6:8.2f} MB for a {size / 1e6:.2f} MB message")
+    return peaks
+
+if __name__ == "__main__":
+    benchmark_gcm()
+    measure_ctr_peak_allocations()
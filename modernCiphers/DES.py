@@ -1,6 +1,19 @@
 # Fixed DES Implementation with proper padding and PyQt integration
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from struct import pack_into, unpack_from
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only the bitsliced key search needs it
+    np = None
 
 # Constants (same as your original)
+DES_KEY_CACHE_SIZE = 64  # distinct keys whose schedules are kept by get_des_key
+
 IP = [58, 50, 42, 34, 26, 18, 10, 2,
       60, 52, 44, 36, 28, 20, 12, 4,
       62, 54, 46, 38, 30, 22, 14, 6,
@@ -152,6 +165,95 @@ def des_process(input_hex, rkb, rk):
     final = permute(combined, IP_inv)
     return final
 
+# Integer engine
+# Blocks and keys are Python ints, MSB first (bit 1 of the tables above is the
+# most significant bit). Permutations are applied one input byte at a time
+# through precomputed tables, and each S-box is merged with P into an SP-box.
+def make_permutation_table(table, in_bits):
+    """lookup[i][v] = output bits contributed by value v in input byte i"""
+    out_bits = len(table)
+    lookup = [[0] * 256 for _ in range(in_bits // 8)]
+    for out_pos, in_pos in enumerate(table):
+        byte, bit = divmod(in_pos - 1, 8)
+        mask = 1 << (out_bits - 1 - out_pos)
+        for value in range(256):
+            if value & (0x80 >> bit):
+                lookup[byte][value] |= mask
+    return lookup
+
+def permute_int(lookup, value, in_bits):
+    result = 0
+    shift = in_bits - 8
+    for byte_table in lookup:
+        result |= byte_table[(value >> shift) & 0xFF]
+        shift -= 8
+    return result
+
+def make_sp_boxes():
+    p_table = make_permutation_table(P, 32)
+    sp_boxes = []
+    for i in range(8):
+        box = []
+        for six in range(64):
+            row = ((six >> 4) & 2) | (six & 1)
+            col = (six >> 1) & 0xF
+            box.append(permute_int(p_table, SBOX[i][row][col] << (28 - 4 * i), 32))
+        sp_boxes.append(box)
+    return sp_boxes
+
+IP_TABLE = make_permutation_table(IP, 64)
+IP_INV_TABLE = make_permutation_table(IP_inv, 64)
+PC1_TABLE = make_permutation_table(PC1, 64)
+PC2_TABLE = make_permutation_table(PC2, 56)
+E_TABLE = make_permutation_table(EXPANSION, 32)
+SP0, SP1, SP2, SP3, SP4, SP5, SP6, SP7 = make_sp_boxes()
+
+def generate_keys_int(key):
+    """16 round keys as 48-bit ints, from a 64-bit int key"""
+    key_permuted = permute_int(PC1_TABLE, key, 64)
+    left = key_permuted >> 28
+    right = key_permuted & 0xFFFFFFF
+    round_keys = []
+    for shift in SHIFT:
+        left = ((left << shift) | (left >> (28 - shift))) & 0xFFFFFFF
+        right = ((right << shift) | (right >> (28 - shift))) & 0xFFFFFFF
+        round_keys.append(permute_int(PC2_TABLE, (left << 28) | right, 56))
+    return round_keys
+
+def des_rounds(left, right, round_keys):
+    """The 16 Feistel rounds on the IP-permuted halves; returns the halves before the final swap"""
+    e0, e1, e2, e3 = E_TABLE
+    for k in round_keys:
+        x = (e0[right >> 24] | e1[(right >> 16) & 0xFF] | e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ k
+        left, right = right, left ^ (
+            SP0[x >> 42] ^ SP1[(x >> 36) & 0x3F] ^ SP2[(x >> 30) & 0x3F] ^ SP3[(x >> 24) & 0x3F] ^
+            SP4[(x >> 18) & 0x3F] ^ SP5[(x >> 12) & 0x3F] ^ SP6[(x >> 6) & 0x3F] ^ SP7[x & 0x3F])
+    return left, right
+
+def des_process_int(block, round_keys):
+    block = permute_int(IP_TABLE, block, 64)
+    left, right = des_rounds(block >> 32, block & 0xFFFFFFFF, round_keys)
+    return permute_int(IP_INV_TABLE, (right << 32) | left, 64)
+
+class DESKey:
+    """DES key schedule computed once, in encryption and (reversed) decryption order"""
+    def __init__(self, key: bytes):
+        if len(key) != 8:
+            raise ValueError("DES key must be exactly 8 bytes (64 bits)")
+        self.encrypt_keys = tuple(generate_keys_int(int.from_bytes(key, 'big')))
+        self.decrypt_keys = self.encrypt_keys[::-1]
+
+    def encrypt_block(self, block: int) -> int:
+        return des_process_int(block, self.encrypt_keys)
+
+    def decrypt_block(self, block: int) -> int:
+        return des_process_int(block, self.decrypt_keys)
+
+@lru_cache(maxsize=DES_KEY_CACHE_SIZE)
+def get_des_key(key: bytes) -> DESKey:
+    """Shared DESKey for key, from a bounded LRU cache"""
+    return DESKey(key)
+
 # Fixed padding functions using PKCS7 padding
 def pkcs7_pad(data_bytes):
     """Add PKCS7 padding to make data multiple of 8 bytes"""
@@ -175,40 +277,550 @@ def des_encrypt_text(plaintext: str, key_hex: str) -> str:
     plaintext_bytes = plaintext.encode('utf-8')
     padded_bytes = pkcs7_pad(plaintext_bytes)
     
-    # Process each 8-byte block
-    result = ""
-    for i in range(0, len(padded_bytes), 8):
-        block = padded_bytes[i:i+8]
-        block_hex = block.hex().upper()
-        encrypted_block = des_encrypt(block_hex, key_hex)
-        result += encrypted_block
+    # Process every 8-byte block with one cached key schedule
+    des_key = get_des_key(bytes.fromhex(key_hex))
+    result = bytearray(len(padded_bytes))
+    des_ecb_into(des_key.encrypt_block, padded_bytes, result)
     
-    return result
+    return result.hex().upper()
 
 def des_decrypt_text(ciphertext_hex: str, key_hex: str) -> str:
     """Decrypt hex string using DES and return text"""
-    # Process each 16-character hex block (8 bytes)
-    decrypted_bytes = b""
-    for i in range(0, len(ciphertext_hex), 16):
-        block_hex = ciphertext_hex[i:i+16]
-        if len(block_hex) == 16:  # Ensure we have a complete block
-            decrypted_block_hex = des_decrypt(block_hex, key_hex)
-            decrypted_bytes += bytes.fromhex(decrypted_block_hex)
+    # Process the complete 16-character hex blocks (8 bytes) with one cached key schedule
+    des_key = get_des_key(bytes.fromhex(key_hex))
+    ciphertext = bytes.fromhex(ciphertext_hex[:len(ciphertext_hex) - len(ciphertext_hex) % 16])
+    decrypted_bytes = bytearray(len(ciphertext))
+    des_ecb_into(des_key.decrypt_block, ciphertext, decrypted_bytes)
     
     # Remove padding and convert to text
-    unpadded_bytes = pkcs7_unpad(decrypted_bytes)
+    unpadded_bytes = pkcs7_unpad(bytes(decrypted_bytes))
     return unpadded_bytes.decode('utf-8')
 
-def des_encrypt(plaintext_hex: str, key_hex: str) -> str:
-    """Core DES encryption function"""
+DES_ENGINES = ('sp', 'reference')
+
+def _check_hex_block(block_hex: str, what: str):
+    """Both engines take exactly one 64-bit block as 16 hex characters"""
+    if len(block_hex) != 16 or any(c not in '0123456789abcdefABCDEF' for c in block_hex):
+        raise ValueError(f"DES {what} must be exactly 16 hex characters (one 64-bit block)")
+
+def des_encrypt(plaintext_hex: str, key_hex: str, engine: str = 'sp') -> str:
+    """Core DES encryption function ('reference' selects the binary-string engine)"""
+    _check_hex_block(plaintext_hex, "plaintext")
+    if engine == 'sp':
+        des_key = get_des_key(bytes.fromhex(key_hex))
+        return format(des_key.encrypt_block(int(plaintext_hex, 16)), '016X')
+    if engine != 'reference':
+        raise ValueError(f"Unknown DES engine '{engine}', expected one of {DES_ENGINES}")
     rkb, rk = generate_keys(key_hex)
     cipher_bin = des_process(plaintext_hex, rkb, rk)
     return bin2hex(cipher_bin)
 
-def des_decrypt(ciphertext_hex: str, key_hex: str) -> str:
-    """Core DES decryption function"""
+def des_decrypt(ciphertext_hex: str, key_hex: str, engine: str = 'sp') -> str:
+    """Core DES decryption function ('reference' selects the binary-string engine)"""
+    _check_hex_block(ciphertext_hex, "ciphertext")
+    if engine == 'sp':
+        des_key = get_des_key(bytes.fromhex(key_hex))
+        return format(des_key.decrypt_block(int(ciphertext_hex, 16)), '016X')
+    if engine != 'reference':
+        raise ValueError(f"Unknown DES engine '{engine}', expected one of {DES_ENGINES}")
     rkb, rk = generate_keys(key_hex)
     rkb_rev = rkb[::-1]
     rk_rev = rk[::-1]
     plaintext_bin = des_process(ciphertext_hex, rkb_rev, rk_rev)
-    return bin2hex(plaintext_bin)
\ No newline at end of file
+    return bin2hex(plaintext_bin)
+
+# Byte-oriented bulk API
+# Blocks are read and written in place with struct, so a message is never
+# split into per-block objects or converted to hex.
+DES_MODES = ('ecb', 'cbc', 'ctr')
+
+# The mode helpers take the 64-bit block function (DESKey.encrypt_block,
+# TDESKey.decrypt_block, ...) so single and triple DES share them.
+def des_ecb_into(block_fn, src, out, offset=0):
+    """Apply block_fn to the whole blocks of src, writing them into out"""
+    for i in range(0, len(src) - len(src) % 8, 8):
+        pack_into('>Q', out, offset + i, block_fn(unpack_from('>Q', src, i)[0]))
+
+def des_cbc_encrypt_into(block_fn, src, out, chain, offset=0):
+    """CBC-encrypt whole blocks of src into out; returns the last ciphertext block (next chain value)"""
+    for i in range(0, len(src) - len(src) % 8, 8):
+        chain = block_fn(unpack_from('>Q', src, i)[0] ^ chain)
+        pack_into('>Q', out, offset + i, chain)
+    return chain
+
+def des_cbc_decrypt_into(block_fn, src, out, chain, offset=0):
+    """CBC-decrypt whole blocks of src into out; returns the last ciphertext block (next chain value)"""
+    for i in range(0, len(src) - len(src) % 8, 8):
+        block = unpack_from('>Q', src, i)[0]
+        pack_into('>Q', out, offset + i, block_fn(block) ^ chain)
+        chain = block
+    return chain
+
+def des_ctr_into(block_fn, src, out, counter, offset=0):
+    """XOR src (any length) with the CTR keystream from counter; returns the next counter"""
+    full = len(src) - len(src) % 8
+    for i in range(0, full, 8):
+        keystream = block_fn(counter)
+        pack_into('>Q', out, offset + i, unpack_from('>Q', src, i)[0] ^ keystream)
+        counter = (counter + 1) & 0xFFFFFFFFFFFFFFFF
+    if full < len(src):
+        keystream = block_fn(counter).to_bytes(8, 'big')
+        for i in range(full, len(src)):
+            out[offset + i] = src[i] ^ keystream[i - full]
+        counter = (counter + 1) & 0xFFFFFFFFFFFFFFFF
+    return counter
+
+def _check_mode_iv(mode, iv):
+    """Validate mode and return the IV as the initial chain value / counter"""
+    if mode not in DES_MODES:
+        raise ValueError(f"Unknown DES mode '{mode}', expected one of {DES_MODES}")
+    if mode == 'ecb':
+        return 0
+    if iv is None or len(iv) != 8:
+        raise ValueError(f"DES {mode.upper()} mode requires an 8-byte IV")
+    return int.from_bytes(iv, 'big')
+
+def _encrypt_blocks(des_key, data, mode, chain):
+    data = memoryview(data).cast('B')
+    if mode == 'ctr':
+        out = bytearray(len(data))
+        des_ctr_into(des_key.encrypt_block, data, out, chain)
+        return out
+
+    full = len(data) - len(data) % 8
+    pad_len = 8 - len(data) % 8
+    last_block = data[full:].tobytes() + bytes([pad_len] * pad_len)
+    out = bytearray(full + 8)
+    if mode == 'ecb':
+        des_ecb_into(des_key.encrypt_block, data, out)
+        des_ecb_into(des_key.encrypt_block, last_block, out, full)
+    else:
+        chain = des_cbc_encrypt_into(des_key.encrypt_block, data, out, chain)
+        des_cbc_encrypt_into(des_key.encrypt_block, last_block, out, chain, full)
+    return out
+
+def _decrypt_blocks(des_key, data, mode, chain):
+    data = memoryview(data).cast('B')
+    out = bytearray(len(data))
+    if mode == 'ctr':
+        des_ctr_into(des_key.encrypt_block, data, out, chain)
+        return out
+
+    if len(data) == 0 or len(data) % 8 != 0:
+        raise ValueError(f"Ciphertext length {len(data)} is not a positive multiple of 8")
+    if mode == 'ecb':
+        des_ecb_into(des_key.decrypt_block, data, out)
+    else:
+        des_cbc_decrypt_into(des_key.decrypt_block, data, out, chain)
+
+    pad_len = out[-1]
+    if not 1 <= pad_len <= 8 or any(b != pad_len for b in out[-pad_len:]):
+        raise ValueError("Invalid padding bytes detected. Padding is corrupted.")
+    del out[-pad_len:]
+    return out
+
+
+def des_encrypt_bytes(data, key, mode='cbc', iv=None):
+    """
+    Encrypt bytes-like data with DES in ECB, CBC or CTR mode.
+    key is 8 bytes or a DESKey; ECB and CBC apply standard PKCS7 padding.
+    Returns a new bytearray.
+    """
+    chain = _check_mode_iv(mode, iv)
+    des_key = key if isinstance(key, DESKey) else get_des_key(bytes(key))
+    return _encrypt_blocks(des_key, data, mode, chain)
+
+def des_decrypt_bytes(data, key, mode='cbc', iv=None):
+    """Decrypt the output of des_encrypt_bytes; returns a new bytearray"""
+    chain = _check_mode_iv(mode, iv)
+    des_key = key if isinstance(key, DESKey) else get_des_key(bytes(key))
+    return _decrypt_blocks(des_key, data, mode, chain)
+
+# Triple DES (EDE)
+# Each stage ends with IP_inv and the next starts with IP, so the two cancel:
+# a 3DES block runs IP once, 48 rounds on the integer halves, and IP_inv once.
+class TDESKey:
+    """Triple-DES EDE key: 16 bytes (K1 K2, K3 = K1) or 24 bytes (K1 K2 K3)"""
+    def __init__(self, key: bytes):
+        if len(key) == 16:
+            k1, k2, k3 = key[:8], key[8:], key[:8]
+        elif len(key) == 24:
+            k1, k2, k3 = key[:8], key[8:16], key[16:]
+        else:
+            raise ValueError("Triple-DES key must be 16 bytes (two-key) or 24 bytes (three-key)")
+        k1, k2, k3 = get_des_key(k1), get_des_key(k2), get_des_key(k3)
+        # E(K1) -> D(K2) -> E(K3) and its inverse D(K3) -> E(K2) -> D(K1)
+        self.encrypt_keys = (k1.encrypt_keys, k2.decrypt_keys, k3.encrypt_keys)
+        self.decrypt_keys = (k3.decrypt_keys, k2.encrypt_keys, k1.decrypt_keys)
+
+    def encrypt_block(self, block: int) -> int:
+        return tdes_process_int(block, self.encrypt_keys)
+
+    def decrypt_block(self, block: int) -> int:
+        return tdes_process_int(block, self.decrypt_keys)
+
+def tdes_process_int(block, stage_keys):
+    ks1, ks2, ks3 = stage_keys
+    block = permute_int(IP_TABLE, block, 64)
+    left, right = des_rounds(block >> 32, block & 0xFFFFFFFF, ks1)
+    # IP(IP_inv(R || L)) == R || L, so each stage just swaps the halves
+    left, right = des_rounds(right, left, ks2)
+    left, right = des_rounds(right, left, ks3)
+    return permute_int(IP_INV_TABLE, (right << 32) | left, 64)
+
+@lru_cache(maxsize=DES_KEY_CACHE_SIZE)
+def get_tdes_key(key: bytes) -> TDESKey:
+    """Cached TDESKey for a 16 or 24 byte key"""
+    return TDESKey(key)
+
+def tdes_encrypt_bytes(data, key, mode='cbc', iv=None):
+    """Triple-DES counterpart of des_encrypt_bytes; key is 16/24 bytes or a TDESKey"""
+    chain = _check_mode_iv(mode, iv)
+    tdes_key = key if isinstance(key, TDESKey) else get_tdes_key(bytes(key))
+    return _encrypt_blocks(tdes_key, data, mode, chain)
+
+def tdes_decrypt_bytes(data, key, mode='cbc', iv=None):
+    """Triple-DES counterpart of des_decrypt_bytes"""
+    chain = _check_mode_iv(mode, iv)
+    tdes_key = key if isinstance(key, TDESKey) else get_tdes_key(bytes(key))
+    return _decrypt_blocks(tdes_key, data, mode, chain)
+
+def tdes_encrypt(plaintext: str, key_hex: str) -> str:
+    """Encrypt text with Triple-DES (ECB, PKCS7) and return it as hex; key is 32 or 48 hex characters"""
+    return tdes_encrypt_bytes(plaintext.encode('utf-8'), bytes.fromhex(key_hex), 'ecb').hex().upper()
+
+def tdes_decrypt(ciphertext_hex: str, key_hex: str) -> str:
+    """Decrypt hex produced by tdes_encrypt and return text"""
+    return tdes_decrypt_bytes(bytes.fromhex(ciphertext_hex), bytes.fromhex(key_hex), 'ecb').decode('utf-8')
+
+# Incremental encryption
+# The encryptor/decryptor objects keep only a partial block (plus, when
+# decrypting a padded mode, the final block) between update() calls, so
+# files of any size are processed in bounded memory.
+DES_STREAM_CHUNK_SIZE = 1 << 16  # bytes read per step by the stream helpers
+
+def _block_cipher_key(key):
+    """A DESKey/TDESKey, or one derived from an 8, 16 or 24 byte key"""
+    if isinstance(key, (DESKey, TDESKey)):
+        return key
+    key = bytes(key)
+    return get_des_key(key) if len(key) == 8 else get_tdes_key(key)
+
+# 'pkcs7' always adds a padding block and checks it strictly; 'legacy' matches
+# pkcs7_pad/pkcs7_unpad (no block for aligned input, lenient removal), as used
+# by des_encrypt_text/des_decrypt_text
+DES_STREAM_PADDINGS = ('pkcs7', 'legacy')
+
+class DESStreamCipher:
+    """Shared state of DESEncryptor and DESDecryptor"""
+    def __init__(self, key, mode='cbc', iv=None, padding='pkcs7'):
+        if padding not in DES_STREAM_PADDINGS:
+            raise ValueError(f"Unknown padding '{padding}', expected one of {DES_STREAM_PADDINGS}")
+        self._chain = _check_mode_iv(mode, iv)
+        self._key = _block_cipher_key(key)
+        self._mode = mode
+        self._padding = padding
+        self._buffer = bytearray()
+        self._finalized = False
+
+    def _take(self, chunk, keep):
+        """Append chunk, then process the whole blocks of the buffer, leaving at least `keep` bytes"""
+        if self._finalized:
+            raise ValueError("update() called after finalize()")
+        buffer = self._buffer
+        buffer += chunk
+        n = max(len(buffer) - keep, 0)
+        n -= n % 8
+        out = bytearray(n)
+        with memoryview(buffer) as view:
+            self._process(view[:n], out)
+        del buffer[:n]
+        return out
+
+    def _finish(self):
+        if self._finalized:
+            raise ValueError("finalize() called twice")
+        self._finalized = True
+        tail = bytes(self._buffer)
+        self._buffer.clear()
+        return tail
+
+class DESEncryptor(DESStreamCipher):
+    """
+    Incremental DES/3DES encryption: update(chunk) returns the ciphertext of
+    the whole blocks seen so far, finalize() pads (ECB/CBC) and flushes the rest.
+    The output equals des_encrypt_bytes/tdes_encrypt_bytes of the concatenated
+    input, or with padding='legacy' the pkcs7_pad output of des_encrypt_text.
+    """
+    def _process(self, src, out):
+        if self._mode == 'ecb':
+            des_ecb_into(self._key.encrypt_block, src, out)
+        elif self._mode == 'cbc':
+            self._chain = des_cbc_encrypt_into(self._key.encrypt_block, src, out, self._chain)
+        else:
+            self._chain = des_ctr_into(self._key.encrypt_block, src, out, self._chain)
+
+    def update(self, chunk):
+        return self._take(chunk, 0)
+
+    def finalize(self):
+        tail = self._finish()
+        if self._mode != 'ctr':
+            pad_len = 8 - len(tail)
+            if self._padding == 'legacy' and pad_len == 8:
+                pad_len = 0
+            tail += bytes([pad_len] * pad_len)
+        out = bytearray(len(tail))
+        self._process(tail, out)
+        return out
+
+class DESDecryptor(DESStreamCipher):
+    """Incremental counterpart of DESEncryptor; finalize() checks and strips the padding"""
+    def _process(self, src, out):
+        if self._mode == 'ecb':
+            des_ecb_into(self._key.decrypt_block, src, out)
+        elif self._mode == 'cbc':
+            self._chain = des_cbc_decrypt_into(self._key.decrypt_block, src, out, self._chain)
+        else:
+            self._chain = des_ctr_into(self._key.encrypt_block, src, out, self._chain)
+
+    def update(self, chunk):
+        # Padded modes hold back the last block until finalize() can unpad it
+        return self._take(chunk, 0 if self._mode == 'ctr' else 1)
+
+    def finalize(self):
+        tail = self._finish()
+        out = bytearray(len(tail))
+        if self._mode == 'ctr':
+            self._process(tail, out)
+            return out
+        if self._padding == 'legacy':
+            if len(tail) not in (0, 8):
+                raise ValueError("Ciphertext length is not a multiple of 8")
+            self._process(tail, out)
+            return bytearray(pkcs7_unpad(bytes(out)))
+        if len(tail) != 8:
+            raise ValueError("Ciphertext length is not a positive multiple of 8")
+        self._process(tail, out)
+        pad_len = out[-1]
+        if not 1 <= pad_len <= 8 or any(b != pad_len for b in out[-pad_len:]):
+            raise ValueError("Invalid padding bytes detected. Padding is corrupted.")
+        del out[-pad_len:]
+        return out
+
+def des_encrypt_stream(src, dst, key, mode='cbc', iv=None, chunk_size=DES_STREAM_CHUNK_SIZE,
+                       hex_framing=False, padding='pkcs7'):
+    """
+    Encrypt the binary file object src into dst, chunk_size bytes at a time.
+    key is 8 bytes (DES) or 16/24 bytes (3DES); with hex_framing=True the
+    ciphertext is written as upper-case hex. mode='ecb', hex_framing=True and
+    padding='legacy' reproduce des_encrypt_text byte for byte.
+    """
+    encryptor = DESEncryptor(key, mode, iv, padding)
+    while True:
+        chunk = src.read(chunk_size)
+        out = encryptor.update(chunk) if chunk else encryptor.finalize()
+        dst.write(out.hex().upper().encode('ascii') if hex_framing else out)
+        if not chunk:
+            break
+
+def des_decrypt_stream(src, dst, key, mode='cbc', iv=None, chunk_size=DES_STREAM_CHUNK_SIZE,
+                       hex_framing=False, padding='pkcs7'):
+    """
+    Decrypt the output of des_encrypt_stream from src into dst with bounded
+    memory. Use the same mode and padding as the encryption (ECB, hex framing
+    and padding='legacy' for des_encrypt_text output).
+    """
+    decryptor = DESDecryptor(key, mode, iv, padding)
+    carry = b''  # odd hex digit left over from the previous chunk
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            if carry:
+                raise ValueError("Hex ciphertext has an odd number of digits")
+            dst.write(decryptor.finalize())
+            break
+        if hex_framing:
+            chunk = carry + bytes(chunk).strip()
+            even = len(chunk) - len(chunk) % 2
+            chunk, carry = bytes.fromhex(chunk[:even].decode('ascii')), chunk[even:]
+        dst.write(decryptor.update(chunk))
+
+def benchmark_tdes(size=1 << 16):
+    """Compare DES and Triple-DES throughput on size bytes in CBC mode"""
+    data = os.urandom(size)
+    iv = os.urandom(8)
+    des_key = get_des_key(os.urandom(8))
+    results = {}
+    for name, encrypt, key in (('DES', des_encrypt_bytes, des_key),
+                               ('3DES (2-key)', tdes_encrypt_bytes, get_tdes_key(os.urandom(16))),
+                               ('3DES (3-key)', tdes_encrypt_bytes, get_tdes_key(os.urandom(24)))):
+        start = time.perf_counter()
+        encrypt(data, key, 'cbc', iv)
+        results[name] = time.perf_counter() - start
+    for name, elapsed in results.items():
+        print(f"{name:13s} {size / elapsed / 1e6:6.3f} MB/s  ({elapsed / results['DES']:.2f}x DES time)")
+    return results
+
+# Bitsliced DES (NumPy) for known-plaintext key search
+# Every DES bit is stored as a "plane": a uint64 array whose bit j of word w
+# belongs to candidate key 64*w + j, so each NumPy bitwise op advances every
+# candidate at once. S-boxes are boolean circuits: the 64 minterms of the six
+# input planes are built with six broadcast ANDs, and each output bit ORs the
+# 32 minterms where its truth table is 1.
+BITSLICE_BATCH_WORDS = 512  # 64 * 512 candidate keys per batch
+
+def make_bitslice_key_map():
+    """Per round, the 48 original key bit indices (0 = MSB) that form its round key"""
+    c, d = [p - 1 for p in PC1[:28]], [p - 1 for p in PC1[28:]]
+    key_map = []
+    shift = 0
+    for s in SHIFT:
+        shift += s
+        cd = c[shift:] + c[:shift] + d[shift:] + d[:shift]
+        key_map.append([cd[p - 1] for p in PC2])
+    return key_map
+
+def make_sbox_minterms():
+    """(8, 4, 32) indices of the 6-bit S-box inputs for which each output bit is 1"""
+    minterms = []
+    for box in SBOX:
+        rows = [[], [], [], []]
+        for x in range(64):
+            value = box[((x >> 4) & 2) | (x & 1)][(x >> 1) & 0xF]
+            for bit in range(4):
+                if (value >> (3 - bit)) & 1:
+                    rows[bit].append(x)
+        minterms.append(rows)
+    return minterms
+
+BITSLICE_KEY_MAP = make_bitslice_key_map()
+SBOX_MINTERMS = make_sbox_minterms()
+
+def bitslice_key_planes(keys):
+    """Transpose a uint64 array of keys (length a multiple of 64) into 64 bit planes"""
+    shifts = np.arange(63, -1, -1, dtype=np.uint64)[:, None]
+    bits = ((keys[None, :] >> shifts) & np.uint64(1)).astype(np.bool_)
+    return np.packbits(bits, axis=1, bitorder='little').view('<u8')
+
+def bitslice_constant_planes(value, n_bits):
+    """Planes (n_bits, 1) broadcasting one known value to every candidate"""
+    bits = [(value >> (n_bits - 1 - i)) & 1 for i in range(n_bits)]
+    return np.array([[0xFFFFFFFFFFFFFFFF if b else 0] for b in bits], dtype=np.uint64)
+
+def bitslice_des_rounds(left, right, key_planes):
+    """16 bitsliced Feistel rounds on IP-permuted half planes; returns the halves before the final swap"""
+    e_index = np.array(EXPANSION) - 1
+    p_index = np.array(P) - 1
+    box_index = np.arange(8)[:, None, None]
+    minterm_index = np.array(SBOX_MINTERMS)
+    for round_map in BITSLICE_KEY_MAP:
+        x = (right[e_index] ^ key_planes[round_map]).reshape(8, 6, -1)
+        minterms = np.full((8, 1, x.shape[2]), 0xFFFFFFFFFFFFFFFF, dtype=np.uint64)
+        for k in range(5, -1, -1):  # last input bit first, so minterm index == 6-bit input value
+            ones = minterms & x[:, k:k + 1]
+            minterms = np.concatenate((minterms ^ ones, ones), axis=1)
+        sbox_out = np.bitwise_or.reduce(minterms[box_index, minterm_index], axis=2).reshape(32, -1)
+        left, right = right, left ^ sbox_out[p_index]
+    return left, right
+
+def bitslice_des_match(keys, plaintext, ciphertext):
+    """The entries of the uint64 key array that encrypt the 64-bit plaintext int to ciphertext"""
+    n_keys = len(keys)
+    padded = np.zeros(-(-n_keys // 64) * 64, dtype=np.uint64)
+    padded[:n_keys] = keys
+    key_planes = bitslice_key_planes(padded)
+
+    # IP is applied to the known blocks once instead of to every candidate
+    block = permute_int(IP_TABLE, plaintext, 64)
+    left, right = bitslice_des_rounds(bitslice_constant_planes(block >> 32, 32),
+                                      bitslice_constant_planes(block & 0xFFFFFFFF, 32), key_planes)
+    target = bitslice_constant_planes(permute_int(IP_TABLE, ciphertext, 64), 64)
+    mismatch = np.bitwise_or.reduce(np.concatenate((right, left)) ^ target, axis=0)
+    hits = np.unpackbits((~mismatch).view(np.uint8), bitorder='little')[:n_keys]
+    return keys[np.flatnonzero(hits)]
+
+KeySearchResult = namedtuple('KeySearchResult', ['keys', 'keys_tested', 'seconds', 'keys_per_second'])
+
+def _key_array(key_space):
+    if isinstance(key_space, range):
+        return np.uint64(key_space.start) + np.arange(len(key_space), dtype=np.uint64) * np.uint64(key_space.step)
+    return np.array(list(key_space), dtype=np.uint64)
+
+def _key_search_chunk(plaintext, ciphertext, key_space, stop_at_first):
+    """Search one slice of the key space; returns (matching key ints, keys tested)"""
+    found = []
+    tested = 0
+    batch = 64 * BITSLICE_BATCH_WORDS
+    for start in range(0, len(key_space), batch):
+        keys = key_space[start:start + batch]
+        if np is not None:
+            found.extend(int(k) for k in bitslice_des_match(_key_array(keys), plaintext, ciphertext))
+        else:  # scalar integer engine fallback
+            found.extend(k for k in keys if des_process_int(plaintext, generate_keys_int(k)) == ciphertext)
+        tested += len(keys)
+        if found and stop_at_first:
+            break
+    return found, tested
+
+def des_key_search(plaintext, ciphertext, key_space, workers=None, stop_at_first=True):
+    """
+    Known-plaintext DES brute force over key_space, a range (or sequence) of
+    64-bit key ints. plaintext/ciphertext are 8 bytes or 16 hex characters.
+    With workers > 1 the key space is split across a process pool.
+    Returns a KeySearchResult with the matching keys (8-byte values) and the
+    throughput in keys/s. Parity bits are ignored by DES, so a space that
+    spans them yields several equivalent keys.
+    """
+    if isinstance(plaintext, str):
+        plaintext = bytes.fromhex(plaintext)
+    if isinstance(ciphertext, str):
+        ciphertext = bytes.fromhex(ciphertext)
+    if len(plaintext) != 8 or len(ciphertext) != 8:
+        raise ValueError("Plaintext and ciphertext must be exactly one 8-byte DES block")
+    plaintext = int.from_bytes(plaintext, 'big')
+    ciphertext = int.from_bytes(ciphertext, 'big')
+
+    start = time.perf_counter()
+    if not workers or workers == 1:
+        found, tested = _key_search_chunk(plaintext, ciphertext, key_space, stop_at_first)
+    else:
+        found, tested = [], 0
+        chunk = max(64 * BITSLICE_BATCH_WORDS, -(-len(key_space) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_key_search_chunk, plaintext, ciphertext,
+                                   key_space[i:i + chunk], stop_at_first)
+                       for i in range(0, len(key_space), chunk)]
+            for future in as_completed(futures):
+                keys, n = future.result()
+                found.extend(keys)
+                tested += n
+                if found and stop_at_first:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    seconds = time.perf_counter() - start
+    return KeySearchResult([k.to_bytes(8, 'big') for k in sorted(found)], tested, seconds,
+                           tested / seconds if seconds else 0.0)
+
+def benchmark_key_search(unknown_bits=20, workers=None):
+    """Recover a key with unknown_bits unknown low bits and compare with the scalar engine"""
+    key = bytes.fromhex('133457799BBCDFF1')
+    plaintext = bytes.fromhex('0123456789ABCDEF')
+    ciphertext = get_des_key(key).encrypt_block(int.from_bytes(plaintext, 'big')).to_bytes(8, 'big')
+    base = int.from_bytes(key, 'big') >> unknown_bits << unknown_bits
+    result = des_key_search(plaintext, ciphertext, range(base, base + (1 << unknown_bits)),
+                            workers=workers, stop_at_first=False)
+    print(f"bitsliced: {result.keys_tested} keys in {result.seconds:.2f}s "
+          f"({result.keys_per_second:,.0f} keys/s), found {[k.hex().upper() for k in result.keys]}")
+
+    start = time.perf_counter()
+    sample = 2000
+    for k in range(base, base + sample):
+        des_process_int(int.from_bytes(plaintext, 'big'), generate_keys_int(k))
+    print(f"scalar:    {sample / (time.perf_counter() - start):,.0f} keys/s")
+    return result
+
+if __name__ == "__main__":
+    benchmark_tdes()
+    benchmark_key_search()
@@ -1,3 +1,36 @@
+import json
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from string import ascii_uppercase
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the pure Python paths are used without it
+    np = None
+
+ALPHABET_TABLE_LIMIT = 1 << 16  # alphabets below this code point use a lookup table, others a sorted search
+
+def _code_points(text: str):
+    """Unicode code points of text as an int64 array, without a per-character loop"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4').astype(np.int64)
+
+def _from_code_points(codes) -> str:
+    return codes.astype('<u4').tobytes().decode('utf-32-le')
+
+def _shift_letters(text: str, key: str, sign: int) -> str:
+    """The original A-Z formula ((t - 'A') +/- (k - 'A')) % 26 + 'A' applied to every character"""
+    if np is not None:
+        return _from_code_points((_code_points(text) - 65 + sign * (_code_points(key) - 65)) % 26 + 65)
+    return ''.join(chr((ord(t) - 65 + sign * (ord(k) - 65)) % 26 + 65) for t, k in zip(text, key))
+
 def otp_encrypt(plaintext: str, key: str) -> str:
     """
     Encrypts the plaintext using the One-Time Pad method.
@@ -6,11 +39,7 @@ def otp_encrypt(plaintext: str, key: str) -> str:
     if len(plaintext) != len(key):
         raise ValueError("Key must be the same length as plaintext")
 
-    ciphertext = ""
-    for p, k in zip(plaintext, key):
-        c = (ord(p) - ord('A') + ord(k) - ord('A')) % 26
-        ciphertext += chr(c + ord('A'))
-    return ciphertext
+    return _shift_letters(plaintext, key, 1)
 
 def otp_decrypt(ciphertext: str, key: str) -> str:
     """
@@ -20,11 +49,254 @@ def otp_decrypt(ciphertext: str, key: str) -> str:
     if len(ciphertext) != len(key):
         raise ValueError("Key must be the same length as ciphertext")
 
-    plaintext = ""
-    for c, k in zip(ciphertext, key):
-        p = (ord(c) - ord('A') - (ord(k) - ord('A'))) % 26
-        plaintext += chr(p + ord('A'))
-    return plaintext
+    return _shift_letters(ciphertext, key, -1)
+
+def otp_xor(data, pad, out=None):
+    """
+    Byte-mode One-Time Pad: XOR data with the first len(data) bytes of pad.
+    data and pad may be any bytes-like object (bytes, bytearray, memoryview,
+    mmap); the result is written into out (which may be data) or a new bytearray.
+    """
+    n = len(data)
+    if len(pad) < n:
+        raise ValueError("Pad must be at least as long as the data")
+    if out is None:
+        out = bytearray(n)
+    if np is not None:
+        np.bitwise_xor(np.frombuffer(data, dtype=np.uint8, count=n), np.frombuffer(pad, dtype=np.uint8, count=n),
+                       out=np.frombuffer(out, dtype=np.uint8, count=n))
+    else:
+        out[:n] = (int.from_bytes(data, 'big') ^ int.from_bytes(memoryview(pad)[:n], 'big')).to_bytes(n, 'big')
+    return out
+
+def _alphabet_indices(text, alphabet, what):
+    """Positions in alphabet of every symbol of text (str or bytes-like), as an int64 array"""
+    if isinstance(text, str):
+        codes, symbols = _code_points(text), _code_points(alphabet)
+    else:
+        codes = np.frombuffer(text, dtype=np.uint8).astype(np.int64)
+        symbols = np.frombuffer(bytes(alphabet), dtype=np.uint8).astype(np.int64)
+    if symbols.max() < ALPHABET_TABLE_LIMIT:
+        # translate-style lookup table indexed by code point, -1 marks foreign symbols
+        table = np.full(symbols.max() + 1, -1, dtype=np.int64)
+        table[symbols] = np.arange(len(symbols))
+        if codes.size and codes.max() >= len(table):
+            raise ValueError(f"{what} contains symbols outside the alphabet")
+        indices = table[codes]
+        if (indices < 0).any():
+            raise ValueError(f"{what} contains symbols outside the alphabet")
+        return indices
+    order = np.argsort(symbols)
+    sorted_symbols = symbols[order]
+    found = np.searchsorted(sorted_symbols, codes).clip(0, len(symbols) - 1)
+    if not np.array_equal(sorted_symbols[found], codes):
+        raise ValueError(f"{what} contains symbols outside the alphabet")
+    return order[found]
+
+def _otp_alphabet(text, key, alphabet, sign):
+    # Checked here so the NumPy and pure-Python paths reject mixed types alike
+    as_str = isinstance(text, str)
+    if isinstance(key, str) != as_str or isinstance(alphabet, str) != as_str:
+        raise ValueError("Text, key and alphabet must all be str or all be bytes-like")
+    if len(key) < len(text):
+        raise ValueError("Key must be at least as long as the text")
+    if not alphabet or len(set(alphabet)) != len(alphabet):
+        raise ValueError("Alphabet must be non-empty with unique symbols")
+    key = key[:len(text)]
+    if np is None:
+        index = {symbol: i for i, symbol in enumerate(alphabet)}
+        try:
+            shifted = [alphabet[(index[t] + sign * index[k]) % len(alphabet)] for t, k in zip(text, key)]
+        except KeyError:
+            raise ValueError("Text or key contains symbols outside the alphabet")
+        return ''.join(shifted) if isinstance(text, str) else bytearray(shifted)
+
+    shifted = (_alphabet_indices(text, alphabet, "Text") + sign * _alphabet_indices(key, alphabet, "Key")) % len(alphabet)
+    if isinstance(text, str):
+        return _from_code_points(_code_points(alphabet)[shifted])
+    return bytearray(np.frombuffer(bytes(alphabet), dtype=np.uint8)[shifted].tobytes())
+
+def otp_encrypt_alphabet(plaintext, key, alphabet=ascii_uppercase):
+    """
+    Alphabet-mode One-Time Pad: c = (p + k) mod len(alphabet) on symbol positions.
+    plaintext/key are str (alphabet a str) or bytes-like (alphabet bytes);
+    symbols outside the alphabet raise ValueError.
+    """
+    return _otp_alphabet(plaintext, key, alphabet, 1)
+
+def otp_decrypt_alphabet(ciphertext, key, alphabet=ascii_uppercase):
+    """Inverse of otp_encrypt_alphabet"""
+    return _otp_alphabet(ciphertext, key, alphabet, -1)
+
+# Pad store
+# A large pad file is memory-mapped and handed out in non-overlapping ranges.
+# The next free offset is persisted (atomically, before the pad is used) in a
+# small JSON index next to the pad, so no byte of pad is ever used twice, even
+# across restarts. Every allocation is also appended to a log, so the cost of
+# an allocation does not grow with the number already made. Allocations take
+# an exclusive lock on a lock file and re-read the index while holding it, so
+# several processes sharing one pad never receive the same range.
+# Messages are XORed against the mapping chunk by chunk.
+PAD_STREAM_CHUNK_SIZE = 1 << 20  # bytes XORed per step by the stream methods
+
+class OTPPadStore:
+    """
+    One-Time Pad store over pad_path. The index (index_path, default
+    pad_path + '.idx') holds the next free offset; allocations are logged to
+    index_path + '.log' and serialized with a file lock on index_path + '.lock'.
+    """
+    def __init__(self, pad_path, index_path=None):
+        self.pad_path = pad_path
+        self.index_path = index_path or pad_path + '.idx'
+        self.log_path = self.index_path + '.log'
+        self._lock = threading.Lock()
+        self._file = open(pad_path, 'rb')
+        try:
+            self.pad_size = os.fstat(self._file.fileno()).st_size
+            if self.pad_size == 0:
+                raise ValueError("Pad file is empty")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._pad = memoryview(self._map)
+        self._lock_file = open(self.index_path + '.lock', 'a+b')
+        try:
+            self._read_next_offset()
+        except Exception:
+            self.close()
+            raise
+
+    @contextmanager
+    def _index_lock(self):
+        """Thread lock plus an exclusive OS lock shared with other processes"""
+        with self._lock:
+            fd = self._lock_file.fileno()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                self._lock_file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                        pass
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    self._lock_file.seek(0)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def _read_next_offset(self):
+        if not os.path.exists(self.index_path):
+            return 0
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("pad_size") != self.pad_size:
+            raise ValueError("Pad index does not belong to this pad file (size mismatch)")
+        return index["next_offset"]
+
+    def _write_next_offset(self, next_offset):
+        """Write the index to a temporary file, then atomically replace the old one"""
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"pad_size": self.pad_size, "next_offset": next_offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    @property
+    def remaining(self):
+        """Bytes of pad not yet handed out (by any process)"""
+        return self.pad_size - self._read_next_offset()
+
+    @property
+    def allocations(self):
+        """List of [offset, length, label] ranges handed out so far, from the log"""
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def allocate(self, length, label=None):
+        """Reserve the next length bytes of pad and persist the index; returns their offset"""
+        if length < 0:
+            raise ValueError("Length must not be negative")
+        with self._index_lock():
+            offset = self._read_next_offset()
+            if length > self.pad_size - offset:
+                raise ValueError(f"Pad exhausted: {length} bytes requested, {self.pad_size - offset} left")
+            self._write_next_offset(offset + length)
+            with open(self.log_path, 'a', encoding='utf-8') as log:
+                log.write(json.dumps([offset, length, label]) + '\n')
+                log.flush()
+                os.fsync(log.fileno())
+        return offset
+
+    def pad(self, offset, length):
+        """Zero-copy memoryview of length pad bytes at offset"""
+        if offset < 0 or length < 0 or offset + length > self.pad_size:
+            raise ValueError("Pad range is outside the pad file")
+        return self._pad[offset:offset + length]
+
+    def encrypt(self, data, label=None):
+        """XOR data with a freshly allocated pad range; returns (offset, ciphertext)"""
+        offset = self.allocate(len(data), label)
+        return offset, otp_xor(data, self.pad(offset, len(data)))
+
+    def decrypt(self, data, offset):
+        """XOR data with the pad range starting at offset (as returned by encrypt)"""
+        return otp_xor(data, self.pad(offset, len(data)))
+
+    def xor_stream(self, src, dst, offset, length=None, chunk_size=PAD_STREAM_CHUNK_SIZE):
+        """XOR the binary file object src into dst against the pad from offset; returns the byte count"""
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        total = 0
+        while length is None or total < length:
+            want = chunk_size if length is None else min(chunk_size, length - total)
+            n = src.readinto(view[:want])
+            if not n:
+                break
+            otp_xor(view[:n], self.pad(offset + total, n), out=view[:n])
+            dst.write(view[:n])
+            total += n
+        return total
+
+    def encrypt_stream(self, src, dst, length=None, label=None, chunk_size=PAD_STREAM_CHUNK_SIZE):
+        """
+        Encrypt src into dst with a new pad range; returns its offset. length
+        defaults to what remains of src, which must then be seekable.
+        """
+        if length is None:
+            start = src.tell()
+            length = src.seek(0, os.SEEK_END) - start
+            src.seek(start)
+        offset = self.allocate(length, label)
+        if self.xor_stream(src, dst, offset, length, chunk_size) != length:
+            raise ValueError("Source ended before the announced length")
+        return offset
+
+    def decrypt_stream(self, src, dst, offset, chunk_size=PAD_STREAM_CHUNK_SIZE):
+        """Decrypt src into dst with the pad range at offset; returns the byte count"""
+        return self.xor_stream(src, dst, offset, chunk_size=chunk_size)
+
+    def close(self):
+        self._pad.release()
+        self._map.close()
+        self._file.close()
+        if hasattr(self, '_lock_file'):
+            self._lock_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 # Example usage (for testing only; remove or comment out in production)
 if __name__ == "__main__":
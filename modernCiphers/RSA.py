@@ -1,9 +1,17 @@
 # RSA Encryption/Decryption Module with Custom Keys
 import random
 import math
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 def power(base, expo, m):
-    """Fast modular exponentiation"""
+    """Fast modular exponentiation (built-in pow, which is implemented in C with windowed exponentiation)"""
+    return pow(base, expo, m)
+
+def binaryPower(base, expo, m):
+    """Bit-by-bit square-and-multiply (the original power), kept as a reference"""
     res = 1
     base = base % m
     while expo > 0:
@@ -13,6 +21,76 @@ def power(base, expo, m):
         expo = expo // 2
     return res
 
+def slidingWindowPower(base, expo, m, window=None):
+    """
+    Left-to-right sliding-window exponentiation: odd powers base^1, base^3, ...,
+    base^(2^w - 1) are precomputed, then each window of up to w bits costs one
+    multiplication instead of one per set bit. Reference implementation.
+    """
+    if m == 1:
+        return 0
+    bits = expo.bit_length()
+    if window is None:
+        window = 1 if bits <= 8 else 3 if bits <= 64 else 4 if bits <= 256 else 5 if bits <= 1024 else 6
+    base = base % m
+    square = base * base % m
+    odd_powers = [base]
+    for _ in range((1 << (window - 1)) - 1):
+        odd_powers.append(odd_powers[-1] * square % m)
+
+    res = 1
+    i = bits - 1
+    while i >= 0:
+        if not (expo >> i) & 1:
+            res = res * res % m
+            i -= 1
+            continue
+        # Longest window of at most `window` bits starting at i and ending in a 1 bit
+        j = max(i - window + 1, 0)
+        while not (expo >> j) & 1:
+            j += 1
+        for _ in range(i - j + 1):
+            res = res * res % m
+        res = res * odd_powers[((expo >> j) & ((1 << (i - j + 1)) - 1)) >> 1] % m
+        i = j - 1
+    return res
+
+class FixedBasePower:
+    """
+    Fixed-base windowed exponentiation with a reusable precomputed table:
+    table[i][j] = base^(j * 2^(w*i)) mod m, so base^expo needs only one
+    multiplication per non-zero w-bit digit of expo and no squarings.
+    Worth it when one base is raised to many exponents (e.g. a group generator);
+    exponents longer than exponent_bits fall back to pow.
+    """
+    def __init__(self, base, m, exponent_bits, window=4):
+        self.base = base % m
+        self.m = m
+        self.exponent_bits = exponent_bits
+        self.window = window
+        self.table = []
+        g = self.base
+        for _ in range(-(-exponent_bits // window)):
+            row = [1, g]
+            for _ in range((1 << window) - 2):
+                row.append(row[-1] * g % m)
+            self.table.append(row)
+            g = row[-1] * g % m  # g^(2^w)
+
+    def __call__(self, expo):
+        if expo.bit_length() > self.exponent_bits:
+            return pow(self.base, expo, self.m)
+        m, mask, window = self.m, (1 << self.window) - 1, self.window
+        res = 1
+        for row in self.table:
+            if not expo:
+                break
+            digit = expo & mask
+            if digit:
+                res = res * row[digit] % m
+            expo >>= window
+        return res % m
+
 def gcd(a, b):
     """Calculate greatest common divisor"""
     while b != 0:
@@ -57,20 +135,72 @@ def isPrime(n, k=5):
         if x == 1 or x == n - 1:
             continue
         for _ in range(r - 1):
-            x = power(x, 2, n)
+            x = x * x % n
             if x == n - 1:
                 break
         else:
             return False
     return True
 
+# Prime search
+# A random odd start is drawn and the next PRIME_SIEVE_WINDOW odd numbers
+# are sieved at once with the primes below SIEVE_PRIME_LIMIT (one slice
+# assignment per small prime). Survivors go through trial division by the
+# primes up to TRIAL_DIVISION_LIMIT (a single gcd with their product) and only
+# then through Miller-Rabin. An exhausted window moves on to the next one.
+SIEVE_PRIME_LIMIT = 1 << 12
+TRIAL_DIVISION_LIMIT = 1 << 16
+PRIME_SIEVE_WINDOW = 1 << 12  # odd candidates sieved per window
+
+def smallPrimes(limit):
+    """All primes below limit (sieve of Eratosthenes)"""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
+SIEVE_PRIMES = smallPrimes(SIEVE_PRIME_LIMIT)[1:]  # odd primes only, candidates are odd
+TRIAL_DIVISION_PRODUCT = math.prod(p for p in smallPrimes(TRIAL_DIVISION_LIMIT) if p >= SIEVE_PRIME_LIMIT)
+
+def millerRabinRounds(bits):
+    """Miller-Rabin rounds for an error below 2^-100 on random candidates (FIPS 186-4, table C.3)"""
+    if bits >= 1024:
+        return 5
+    if bits >= 512:
+        return 7
+    return 40
+
 def generatePrime(bits=16):
-    """Generate a random prime number"""
+    """Generate a random prime number of exactly `bits` bits, with its two top bits set"""
+    if bits < 3:
+        raise ValueError("Primes need at least 3 bits")
+    if bits <= 16:
+        while True:
+            n = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+            if isPrime(n, millerRabinRounds(bits)):
+                return n
+
+    rounds = millerRabinRounds(bits)
+    top = 1 << bits
+    start = secrets.randbits(bits) | (3 << (bits - 2)) | 1
     while True:
-        n = random.getrandbits(bits)
-        n |= (1 << bits - 1) | 1  # Set MSB and LSB to 1
-        if isPrime(n):
-            return n
+        if start + 2 * PRIME_SIEVE_WINDOW >= top:
+            start = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+            continue
+        # candidates[i] stands for start + 2*i; clear those divisible by a small prime
+        candidates = bytearray([1]) * PRIME_SIEVE_WINDOW
+        for sp in SIEVE_PRIMES:
+            first = (-start * (sp + 1) // 2) % sp  # i with start + 2*i == 0 (mod sp)
+            candidates[first::sp] = bytes(len(range(first, PRIME_SIEVE_WINDOW, sp)))
+        for i in range(PRIME_SIEVE_WINDOW):
+            if not candidates[i]:
+                continue
+            n = start + 2 * i
+            if math.gcd(n, TRIAL_DIVISION_PRODUCT) == 1 and isPrime(n, rounds):
+                return n
+        start += 2 * PRIME_SIEVE_WINDOW
 
 def validatePrimes(p, q):
     """
@@ -198,28 +328,48 @@ def validateKeySet(p, q, e, d=None):
     
     return True, ["All parameters are valid"], computed
 
-def generateKeys():
-    """Generate RSA key pair with random primes"""
-    p = generatePrime(16)
-    q = generatePrime(16)
+def generateRSAPrime(bits, e=65537):
+    """Random prime p of `bits` bits with gcd(e, p-1) = 1, so e is invertible"""
+    while True:
+        p = generatePrime(bits)
+        if gcd(e, p - 1) == 1:
+            return p
+
+def generateKeys(bits=2048, e=65537, workers=None):
+    """
+    Generate RSA key pair with random primes; n has exactly `bits` bits
+    (2048, 3072, 4096, ...). With workers >= 2 the primes are searched in a
+    process pool and the first two distinct results are used as p and q.
+    Returns: (e, d, n, p, q)
+    """
+    if bits < 16:
+        raise ValueError("RSA modulus must have at least 16 bits")
+    p_bits, q_bits = bits - bits // 2, bits // 2
+    if workers and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(generateRSAPrime, (p_bits, q_bits)[i % 2], e) for i in range(max(workers, 2))]
+            found = {p_bits: [], q_bits: []} if p_bits != q_bits else {p_bits: []}
+            for future in as_completed(futures):
+                prime = future.result()
+                found[prime.bit_length()].append(prime)
+                if p_bits != q_bits and found[p_bits] and found[q_bits]:
+                    p, q = found[p_bits][0], found[q_bits][0]
+                    break
+                if p_bits == q_bits and len(set(found[p_bits])) >= 2:
+                    p, q = list(dict.fromkeys(found[p_bits]))[:2]
+                    break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        p = generateRSAPrime(p_bits, e)
+        q = generateRSAPrime(q_bits, e)
     while p == q:
-        q = generatePrime(16)
-    
+        q = generateRSAPrime(q_bits, e)
+
     n = p * q
     phi = (p - 1) * (q - 1)
-    
-    # Choose e
-    e = 65537  # Common choice
-    if gcd(e, phi) != 1:
-        e = 3
-        while gcd(e, phi) != 1:
-            e += 2
-    
-    # Compute d
-    d = modInverse(e, phi)
-    if d == -1:
-        return generateKeys()  # Retry
-    
+    d = pow(e, -1, phi)
     return e, d, n, p, q
 
 def stringToNumbers(message):
@@ -241,6 +391,28 @@ def decryptNumber(c, d, n):
     """Decrypt a single number"""
     return power(c, d, n)
 
+def computeCRTParams(p, q, d):
+    """
+    Precompute the Chinese Remainder Theorem values for private-key operations
+    Returns: (dP, dQ, qInv) with dP = d mod (p-1), dQ = d mod (q-1), qInv = q^-1 mod p
+    """
+    return d % (p - 1), d % (q - 1), pow(q, -1, p)
+
+def decryptNumberCRT(c, keys):
+    """
+    Decrypt a single number with two half-size exponentiations (mod p and mod q)
+    recombined with Garner's formula; same result as decryptNumber(c, d, n)
+    """
+    p, q = keys['p'], keys['q']
+    m1 = power(c, keys['dP'], p)
+    m2 = power(c, keys['dQ'], q)
+    h = (keys['qInv'] * (m1 - m2)) % p
+    return m2 + h * q
+
+def _addCRTParams(keys):
+    keys['dP'], keys['dQ'], keys['qInv'] = computeCRTParams(keys['p'], keys['q'], keys['d'])
+    return keys
+
 # Global variables to store keys
 _custom_keys = None
 _generated_keys = None
@@ -267,6 +439,7 @@ def setCustomKeys(p, q, e, d=None):
             'n': computed['n'],
             'phi_n': computed['phi_n']
         }
+        _addCRTParams(_custom_keys)
         return True, "Custom keys set successfully", _custom_keys
     else:
         return False, "; ".join(messages), None
@@ -284,6 +457,7 @@ def useGeneratedKeys():
             'n': n,
             'phi_n': (p-1)*(q-1)
         }
+        _addCRTParams(_generated_keys)
     return _generated_keys
 
 def getCurrentKeys():
@@ -340,13 +514,158 @@ def decrypt(encrypted_numbers, use_custom_keys=True):
     else:
         keys = useGeneratedKeys()
     
-    d, n = keys['d'], keys['n']
-    
-    # Decrypt each number
-    decrypted_numbers = [decryptNumber(num, d, n) for num in encrypted_numbers]
+    # Decrypt each number (CRT: two half-size exponentiations per number)
+    decrypted_numbers = [decryptNumberCRT(num, keys) for num in encrypted_numbers]
     
     return numbersToString(decrypted_numbers)
 
+# Block mode
+# Instead of one modular exponentiation per character, the message bytes are
+# split into blocks of k - 11 bytes (k = byte length of n), each padded with
+# PKCS#1 v1.5 type 2 (00 02 PS 00 M, PS = at least 8 random non-zero bytes)
+# and encrypted as one integer. Every ciphertext block is serialized as
+# exactly k big-endian bytes.
+PKCS1_OVERHEAD = 11  # 00 02, at least 8 bytes of PS, 00
+
+def keyByteLength(n):
+    """Size k of the modulus in bytes"""
+    return (n.bit_length() + 7) // 8
+
+def pkcs1Pad(block, k):
+    """PKCS#1 v1.5 encryption padding (type 2) of block to k bytes"""
+    if len(block) > k - PKCS1_OVERHEAD:
+        raise ValueError(f"Block of {len(block)} bytes is too long for a {k}-byte modulus")
+    ps_len = k - 3 - len(block)
+    ps = bytearray()
+    while len(ps) < ps_len:
+        ps += os.urandom(ps_len - len(ps)).replace(b'\x00', b'')
+    return b'\x00\x02' + bytes(ps) + b'\x00' + bytes(block)
+
+def pkcs1Unpad(em):
+    """Strip PKCS#1 v1.5 type 2 padding; raises ValueError if it is malformed"""
+    separator = em.find(b'\x00', 2)
+    if em[0] != 0 or em[1] != 2 or separator < 2 + 8:
+        raise ValueError("Decryption error: invalid PKCS#1 padding")
+    return em[separator + 1:]
+
+def _selectKeys(use_custom_keys):
+    if use_custom_keys and _custom_keys is not None:
+        return _custom_keys
+    return useGeneratedKeys()
+
+def encryptBlocks(message, use_custom_keys=True):
+    """
+    Encrypt a string (UTF-8) or bytes message in PKCS#1 v1.5 padded blocks
+    Returns: tuple (ciphertext_bytes, public_key_info); the ciphertext is a
+    multiple of k bytes, k being the byte length of n (at least 12)
+    """
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    keys = _selectKeys(use_custom_keys)
+    e, n = keys['e'], keys['n']
+    k = keyByteLength(n)
+    if k < PKCS1_OVERHEAD + 1:
+        raise ValueError(f"n = {n} is too small for block mode; it needs at least {PKCS1_OVERHEAD + 1} bytes (89 bits)")
+
+    step = k - PKCS1_OVERHEAD
+    ciphertext = bytearray()
+    for i in range(0, max(len(message), 1), step):
+        m = int.from_bytes(pkcs1Pad(message[i:i + step], k), 'big')
+        ciphertext += encryptNumber(m, e, n).to_bytes(k, 'big')
+    return bytes(ciphertext), (e, n)
+
+def decryptBlocks(ciphertext, use_custom_keys=True, encoding='utf-8'):
+    """
+    Decrypt the output of encryptBlocks
+    Returns: the message as a string, or as bytes when encoding is None
+    """
+    keys = _selectKeys(use_custom_keys)
+    n = keys['n']
+    k = keyByteLength(n)
+    if len(ciphertext) == 0 or len(ciphertext) % k != 0:
+        raise ValueError(f"Ciphertext length must be a positive multiple of {k} bytes")
+
+    message = bytearray()
+    for i in range(0, len(ciphertext), k):
+        c = int.from_bytes(ciphertext[i:i + k], 'big')
+        if c >= n:
+            raise ValueError("Decryption error: ciphertext block is not smaller than n")
+        message += pkcs1Unpad(decryptNumberCRT(c, keys).to_bytes(k, 'big'))
+    return bytes(message) if encoding is None else message.decode(encoding)
+
+def benchmarkDecryption(modulus_bits=(32, 64, 128, 256, 512, 1024, 2048), trials=5):
+    """
+    Time private-key operations with the full modulus against CRT for each modulus size
+    Returns: {bits: (full_seconds, crt_seconds)} per operation
+    """
+    results = {}
+    for bits in modulus_bits:
+        p = generatePrime(bits // 2)
+        q = generatePrime(bits // 2)
+        while p == q or gcd(65537, (p - 1) * (q - 1)) != 1:
+            q = generatePrime(bits // 2)
+        keys = {'p': p, 'q': q, 'e': 65537, 'n': p * q, 'd': modInverse(65537, (p - 1) * (q - 1))}
+        _addCRTParams(keys)
+        c = encryptNumber(random.randrange(2, keys['n'] - 1), keys['e'], keys['n'])
+
+        start = time.perf_counter()
+        for _ in range(trials):
+            full = decryptNumber(c, keys['d'], keys['n'])
+        full_time = (time.perf_counter() - start) / trials
+        start = time.perf_counter()
+        for _ in range(trials):
+            crt = decryptNumberCRT(c, keys)
+        crt_time = (time.perf_counter() - start) / trials
+        if full != crt:
+            raise ValueError("CRT decryption disagrees with full-modulus decryption")
+        results[bits] = (full_time, crt_time)
+        print(f"{bits:5d}-bit n: full {full_time * 1000:9.3f} ms  CRT {crt_time * 1000:9.3f} ms  "
+              f"speedup {full_time / crt_time:4.2f}x")
+    return results
+
+def benchmarkPower(modulus_bits=(1024, 2048, 4096), trials=3):
+    """
+    Microbenchmark of the exponentiation engines on random odd moduli and full-size exponents
+    Returns: {bits: {engine: seconds per exponentiation}}
+    """
+    results = {}
+    for bits in modulus_bits:
+        m = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        base = random.randrange(2, m)
+        exponents = [random.getrandbits(bits) for _ in range(trials)]
+        start = time.perf_counter()
+        fixed = FixedBasePower(base, m, bits)
+        precompute = time.perf_counter() - start
+
+        timings = {}
+        expected = [pow(base, x, m) for x in exponents]
+        for name, engine in (('square-and-multiply', lambda x: binaryPower(base, x, m)),
+                             ('sliding window', lambda x: slidingWindowPower(base, x, m)),
+                             ('built-in pow', lambda x: power(base, x, m)),
+                             ('fixed base', fixed)):
+            start = time.perf_counter()
+            values = [engine(x) for x in exponents]
+            timings[name] = (time.perf_counter() - start) / trials
+            if values != expected:
+                raise ValueError(f"{name} exponentiation returned a wrong result")
+        results[bits] = timings
+        print(f"{bits}-bit modulus (fixed-base table built in {precompute * 1000:.1f} ms):")
+        for name, seconds in timings.items():
+            print(f"  {name:20s} {seconds * 1000:9.3f} ms  ({timings['square-and-multiply'] / seconds:5.1f}x)")
+    return results
+
+def benchmarkKeyGeneration(modulus_bits=(2048, 3072, 4096), workers=None):
+    """Time key generation for each modulus size; returns {bits: seconds}"""
+    results = {}
+    for bits in modulus_bits:
+        start = time.perf_counter()
+        e, d, n, p, q = generateKeys(bits, workers=workers)
+        results[bits] = time.perf_counter() - start
+        if n.bit_length() != bits or pow(pow(12345, e, n), d, n) != 12345:
+            raise ValueError(f"Invalid {bits}-bit key generated")
+        print(f"{bits}-bit RSA key generated in {results[bits]:.2f}s")
+    return results
+
 def getKeyValidationConditions():
     """
     Return the conditions that RSA keys must satisfy
@@ -413,6 +732,27 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Error: {e}")
     
+    print("\n=== Testing Block Mode ===")
+    p = generatePrime(256)
+    q = generatePrime(256)
+    success, msg, keys = setCustomKeys(p, q, 65537)
+    if success:
+        test_message = "Block mode packs many bytes into each RSA operation. " * 4
+        ciphertext, public_key = encryptBlocks(test_message)
+        per_char, _ = encrypt(test_message)
+        print(f"n has {keyByteLength(keys['n'])} bytes: {len(ciphertext)} ciphertext bytes "
+              f"vs {len(per_char)} numbers in per-character mode")
+        print(f"Success: {decryptBlocks(ciphertext) == test_message}")
+
+    print("\n=== Decryption Benchmark (full modulus vs CRT) ===")
+    benchmarkDecryption()
+
+    print("\n=== Exponentiation Benchmark ===")
+    benchmarkPower()
+
+    print("\n=== Key Generation Benchmark ===")
+    benchmarkKeyGeneration()
+
     print("\n=== Testing Invalid Keys ===")
     # Test with invalid keys
     invalid_cases = [
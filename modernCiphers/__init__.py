@@ -1,16 +1,16 @@
-from .One_Time_Pad import otp_encrypt, otp_decrypt
+from .One_Time_Pad import otp_encrypt, otp_decrypt, otp_xor, otp_encrypt_alphabet, otp_decrypt_alphabet
 from .rc4 import rc4_encrypt, rc4_decrypt
-from .DES import des_encrypt, des_decrypt
-from .AES import aes_encrypt, aes_decrypt
+from .DES import des_encrypt, des_decrypt, tdes_encrypt, tdes_decrypt
+from .AES import aes_encrypt, aes_decrypt, aes_encrypt_stream, aes_decrypt_stream, aes_encrypt_file, aes_decrypt_file
 from .RSA import encrypt as RSA_encrypt, decrypt as RSA_decrypt, setCustomKeys	
 from .Diffie_Hellman import generate_dh_public_key, calculate_shared_secret, encrypt as dh_encrypt, decrypt as dh_decrypt
 from .EL_Gamel import generate_elgamal_keys, elgamal_encrypt, elgamal_decrypt, power
 
 
-__all__ = ['otp_encrypt', 'otp_decrypt']
+__all__ = ['otp_encrypt', 'otp_decrypt', 'otp_xor', 'otp_encrypt_alphabet', 'otp_decrypt_alphabet']
 __all__ += ['rc4_encrypt', 'rc4_decrypt']
-__all__ += ['des_encrypt', 'des_decrypt']
-__all__ += ['aes_encrypt', 'aes_decrypt']
+__all__ += ['des_encrypt', 'des_decrypt', 'tdes_encrypt', 'tdes_decrypt']
+__all__ += ['aes_encrypt', 'aes_decrypt', 'aes_encrypt_stream', 'aes_decrypt_stream', 'aes_encrypt_file', 'aes_decrypt_file']
 __all__ += ['RSA_encrypt', 'RSA_decrypt', 'setCustomKeys']
 __all__ += ['generate_dh_public_key', 'calculate_shared_secret', 'dh_encrypt', 'dh_decrypt']
 __all__ += ['generate_elgamal_keys', 'elgamal_encrypt', 'elgamal_decrypt', 'power']
\ No newline at end of file
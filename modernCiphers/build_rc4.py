@@ -0,0 +1,24 @@
+# Builds the native RC4 extension (modernCiphers/_rc4) with cffi in API mode.
+# Run from anywhere:  python modernCiphers/build_rc4.py
+# rc4.py falls back to pure Python when the extension has not been built.
+import os
+import cffi
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ffibuilder = cffi.FFI()
+ffibuilder.cdef("""
+    void rc4_init(unsigned char *state, const unsigned char *key, size_t key_len);
+    void rc4_crypt(unsigned char *state, const unsigned char *in, unsigned char *out, size_t len);
+""")
+ffibuilder.set_source(
+    "modernCiphers._rc4",
+    '#include "rc4.h"',
+    sources=["modernCiphers/rc4.c"],
+    include_dirs=["modernCiphers"],
+    extra_compile_args=["-O3"] if os.name != "nt" else ["/O2"],
+)
+
+if __name__ == "__main__":
+    os.chdir(ROOT)  # source paths are relative to the project directory
+    ffibuilder.compile(verbose=True)
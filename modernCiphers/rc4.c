@@ -0,0 +1,36 @@
+#include "rc4.h"
+
+// Key-scheduling algorithm (KSA): fills state with S and zeroes i, j
+void rc4_init(unsigned char *state, const unsigned char *key, size_t key_len) {
+    unsigned char *S = state;
+    unsigned char j = 0;
+    for (int i = 0; i < 256; i++) {
+        S[i] = (unsigned char) i;
+    }
+    for (int i = 0; i < 256; i++) {
+        unsigned char t = S[i];
+        j = (unsigned char) (j + t + key[i % key_len]);
+        S[i] = S[j];
+        S[j] = t;
+    }
+    state[256] = 0;
+    state[257] = 0;
+}
+
+// PRGA: XOR len bytes of in with the keystream into out (in == out is allowed)
+void rc4_crypt(unsigned char *state, const unsigned char *in, unsigned char *out, size_t len) {
+    unsigned char *S = state;
+    unsigned char i = state[256];
+    unsigned char j = state[257];
+    for (size_t n = 0; n < len; n++) {
+        i = (unsigned char) (i + 1);
+        unsigned char si = S[i];
+        j = (unsigned char) (j + si);
+        unsigned char sj = S[j];
+        S[i] = sj;
+        S[j] = si;
+        out[n] = in[n] ^ S[(unsigned char) (si + sj)];
+    }
+    state[256] = i;
+    state[257] = j;
+}
@@ -0,0 +1,12 @@
+#ifndef RC4_H
+#define RC4_H
+
+#include <stddef.h>
+
+/* RC4 state: S[0..255], then i and j */
+#define RC4_STATE_SIZE 258
+
+void rc4_init(unsigned char *state, const unsigned char *key, size_t key_len);
+void rc4_crypt(unsigned char *state, const unsigned char *in, unsigned char *out, size_t len);
+
+#endif
@@ -1,49 +1,231 @@
 
 import base64
+import threading
+from collections import OrderedDict
+from hashlib import sha256
 
-def rc4_encrypt_decrypt(data, key):
-    """Core RC4 algorithm - works for both encryption and decryption"""
-    # Convert key to bytes if it's a string
+try:
+    from ._rc4 import ffi, lib  # built by build_rc4.py
+except ImportError:  # extension not built, use the pure Python implementation
+    ffi = lib = None
+
+HAVE_NATIVE_RC4 = lib is not None
+RC4_STATE_SIZE = 258  # S-box, then i and j (layout shared with rc4.c)
+
+def rc4_key_schedule(key):
+    """Key-scheduling algorithm (KSA): the 258-byte state for key"""
     if isinstance(key, str):
         key = key.encode('utf-8')
-    if isinstance(data, str):
-        data = data.encode('utf-8')
-    
-    # Initialize S-box
+    key = bytes(key)  # bytearray/memoryview keys, accepted by both implementations
+    if len(key) == 0:
+        raise ValueError("RC4 key must not be empty")
+    state = bytearray(RC4_STATE_SIZE)
+    if lib is not None:
+        lib.rc4_init(ffi.from_buffer(state), key, len(key))
+        return state
+
     S = list(range(256))
     j = 0
-    
-    # Key-scheduling algorithm (KSA)
     for i in range(256):
         j = (j + S[i] + key[i % len(key)]) % 256
         S[i], S[j] = S[j], S[i]
-    
-    # Pseudo-random generation algorithm (PRGA)
-    i = j = 0
+    state[:256] = bytes(S)
+    return state
+
+def rc4_crypt_into(state, data, out):
+    """
+    Pseudo-random generation algorithm (PRGA): XOR data with the keystream
+    into out and advance state. out may be data itself (in-place).
+    Lengths are counted in bytes whatever the buffers' item format.
+    """
+    state_bytes = memoryview(state).cast('B')
+    if len(state_bytes) != RC4_STATE_SIZE:
+        raise ValueError(f"RC4 state must be {RC4_STATE_SIZE} bytes, got {len(state_bytes)}")
+    src = memoryview(data).cast('B')
+    dst = memoryview(out).cast('B')
+    if len(dst) < len(src):
+        raise ValueError("Output buffer is smaller than the input")
+    if lib is not None:
+        lib.rc4_crypt(ffi.from_buffer(state_bytes, require_writable=True), ffi.from_buffer(src),
+                      ffi.from_buffer(dst, require_writable=True), len(src))
+        return out
+
+    S = list(state_bytes[:256])
+    i, j = state_bytes[256], state_bytes[257]
     result = []
-    
-    for byte in data:
-        i = (i + 1) % 256
-        j = (j + S[i]) % 256
-        S[i], S[j] = S[j], S[i]
-        keystream_byte = S[(S[i] + S[j]) % 256]
-        result.append(byte ^ keystream_byte)
-    
+    append = result.append
+    for byte in bytes(src):
+        i = (i + 1) & 0xFF
+        si = S[i]
+        j = (j + si) & 0xFF
+        sj = S[j]
+        S[i], S[j] = sj, si
+        append(byte ^ S[(si + sj) & 0xFF])
+    dst[:len(result)] = bytes(result)
+    state_bytes[:256] = bytes(S)
+    state_bytes[256], state_bytes[257] = i, j
+    return out
+
+def rc4_xor_inplace(buffer, key):
+    """XOR a writable buffer (bytearray, memoryview, mmap, ...) with the RC4 keystream in place"""
+    return rc4_crypt_into(rc4_key_schedule(key), buffer, buffer)
+
+def rc4_encrypt_decrypt(data, key, keystream_cache=None):
+    """Core RC4 algorithm - works for both encryption and decryption"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if keystream_cache is not None:
+        return keystream_cache.xor(data, key)
+    result = bytearray(data)
+    rc4_xor_inplace(result, key)
     return bytes(result)
 
-def rc4_encrypt(plain_text, key):
+RC4_STREAM_CHUNK_SIZE = 1 << 16  # bytes per read in RC4.process_stream
+
+class RC4:
+    """
+    Stateful RC4 cipher: S, i and j persist between process() calls, so a
+    stream can be encrypted in pieces and the KSA runs only once per key.
+    drop=N discards the first N keystream bytes (RC4-drop[N]).
+    """
+    def __init__(self, key, drop=0):
+        self._state = rc4_key_schedule(key)
+        if drop:
+            self.skip(drop)
+
+    def skip(self, n):
+        """Discard the next n keystream bytes"""
+        scratch = bytearray(min(n, RC4_STREAM_CHUNK_SIZE))
+        while n > 0:
+            view = memoryview(scratch)[:min(n, len(scratch))]
+            rc4_crypt_into(self._state, view, view)
+            n -= len(view)
+
+    def process(self, chunk, out=None):
+        """XOR chunk with the next keystream bytes; writes into out (may be chunk) when given"""
+        if out is None:
+            out = bytearray(len(chunk))
+        return rc4_crypt_into(self._state, chunk, out)
+
+    def snapshot(self):
+        """Copy of the 258-byte state (S, i, j), for restore()"""
+        return bytearray(self._state)
+
+    def restore(self, state):
+        """Rewind or fast-forward to a state returned by snapshot()"""
+        if len(state) != RC4_STATE_SIZE:
+            raise ValueError(f"RC4 state must be {RC4_STATE_SIZE} bytes")
+        self._state[:] = state
+
+    def process_stream(self, src, dst, chunk_size=RC4_STREAM_CHUNK_SIZE):
+        """Encrypt/decrypt the binary file object src into dst with one reused buffer; returns the byte count"""
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        total = 0
+        while True:
+            n = src.readinto(buffer)
+            if not n:
+                return total
+            self.process(view[:n], view[:n])
+            dst.write(view[:n])
+            total += n
+
+RC4_CACHE_MAX_BYTES = 1 << 24  # default total keystream kept by RC4KeystreamCache
+
+class RC4KeystreamCache:
+    """
+    Opt-in LRU cache of the keystream prefix per key, bounded by the total
+    number of cached bytes. A message at offset zero becomes one XOR against
+    the cached prefix, which is extended lazily (from the saved RC4 state)
+    when a longer message arrives. Entries are keyed on the SHA-256 of the key
+    and zeroed on eviction; hits, misses and extensions are counted for tuning.
+    """
+    def __init__(self, max_bytes=RC4_CACHE_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError("Cache size must be at least 1 byte")
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(key):
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        return sha256(key).digest()
+
+    @staticmethod
+    def _wipe(entry):
+        cipher, keystream = entry
+        cipher.restore(bytes(RC4_STATE_SIZE))
+        keystream[:] = bytes(len(keystream))
+
+    def _evict_to(self, limit):
+        while self.size_bytes > limit and self._entries:
+            entry = self._entries.popitem(last=False)[1]
+            self.size_bytes -= len(entry[1])
+            self._wipe(entry)
+
+    def xor(self, data, key):
+        """XOR data with the keystream of key from offset zero, i.e. RC4 encrypt/decrypt"""
+        n = len(data)
+        cache_key = self._cache_key(key)
+        with self._lock:
+            # The entry in use is taken out so eviction only drops other keys
+            entry = self._entries.pop(cache_key, None)
+            if entry is None:
+                self.misses += 1
+                entry = (RC4(key), bytearray())
+            else:
+                self.hits += 1
+                self.size_bytes -= len(entry[1])
+            cipher, keystream = entry
+            if len(keystream) < n:
+                if keystream:
+                    self.extensions += 1
+                keystream += cipher.process(bytes(n - len(keystream)))
+            result = (int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:n], 'big')).to_bytes(n, 'big')
+            if len(keystream) <= self.max_bytes:
+                self._evict_to(self.max_bytes - len(keystream))
+                self._entries[cache_key] = entry
+                self.size_bytes += len(keystream)
+            else:
+                self._wipe(entry)
+        return result
+
+    def evict(self, key):
+        """Drop and zero one entry; returns False if it was not cached"""
+        with self._lock:
+            entry = self._entries.pop(self._cache_key(key), None)
+            if entry is None:
+                return False
+            self.size_bytes -= len(entry[1])
+            self._wipe(entry)
+        return True
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                self._wipe(entry)
+            self._entries.clear()
+            self.size_bytes = 0
+
+def rc4_encrypt(plain_text, key, keystream_cache=None):
     """Encrypt text using RC4 and return base64 encoded result"""
     try:
-        encrypted_bytes = rc4_encrypt_decrypt(plain_text, key)
+        encrypted_bytes = rc4_encrypt_decrypt(plain_text, key, keystream_cache)
         return base64.b64encode(encrypted_bytes).decode('utf-8')
     except Exception as e:
         raise ValueError(f"Encryption Error: {str(e)}")
 
-def rc4_decrypt(cipher_text_base64, key):
+def rc4_decrypt(cipher_text_base64, key, keystream_cache=None):
     """Decrypt base64 encoded RC4 ciphertext"""
     try:
         encrypted_bytes = base64.b64decode(cipher_text_base64)
-        decrypted_bytes = rc4_encrypt_decrypt(encrypted_bytes, key)
+        decrypted_bytes = rc4_encrypt_decrypt(encrypted_bytes, key, keystream_cache)
         return decrypted_bytes.decode('utf-8')
     except Exception as e:
         raise ValueError(f"Decryption Error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""Allocation regression tests for the AES CTR buffer interface"""
+from modernCiphers.AES import measure_ctr_peak_allocations
+
+CTR_INPLACE_PEAK_LIMIT = 6_000_000  # bytes; the in-place peak is bounded by one keystream batch
+MESSAGE_SIZE = 8 << 20
+
+
+def test_ctr_in_place_peak_is_bounded():
+    peaks = measure_ctr_peak_allocations(MESSAGE_SIZE)
+    assert peaks['in place'] < CTR_INPLACE_PEAK_LIMIT
+
+
+def test_ctr_in_place_peak_is_well_below_new_bytes():
+    peaks = measure_ctr_peak_allocations(MESSAGE_SIZE)
+    assert peaks['in place'] * 3 < peaks['new bytes']